@@ -4,9 +4,12 @@ Uses psycopg v3 for PostgreSQL operations
 """
 
 import os
+import threading
+from contextlib import contextmanager
 from typing import Optional, Dict, Any
 from datetime import datetime
 import psycopg
+from psycopg_pool import ConnectionPool
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -17,11 +20,69 @@ if not DATABASE_URL:
     raise ValueError("DATABASE_URL not found in environment variables")
 
 
+# Upper bound on pooled connections per process (each Celery worker process has its own pool)
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
 def get_db_connection():
     """Create psycopg3 connection from DATABASE_URL env var"""
     return psycopg.connect(DATABASE_URL)
 
 
+def _get_pool() -> ConnectionPool:
+    """Get the process-wide connection pool, opening it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # check: test each connection before lending it, so one the server or a load
+                # balancer dropped while idle is replaced instead of failing the caller
+                _pool = ConnectionPool(
+                    DATABASE_URL,
+                    min_size=1,
+                    max_size=DB_POOL_MAX_SIZE,
+                    check=ConnectionPool.check_connection,
+                    open=True,
+                )
+    return _pool
+
+
+def _reset_pool_in_child():
+    """
+    Forget the parent's pool after fork (e.g. Celery prefork workers)
+
+    The child must not use (or close) connections whose sockets it shares with
+    the parent, and the pool's worker threads don't survive fork, so the child
+    opens its own pool on first use.
+    """
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_pool_in_child)
+
+
+@contextmanager
+def db_connection():
+    """
+    Borrow a pooled connection for one operation
+
+    Job progress updates run many times per job, so reusing connections skips
+    the TCP/TLS/auth handshake each time. The connection goes back to the pool
+    when the block exits, committed on success and rolled back if it raises.
+
+    Usage:
+        with db_connection() as conn, conn.cursor() as cursor:
+            cursor.execute(...)
+    """
+    with _get_pool().connection() as conn:
+        yield conn
+
+
 def create_job() -> int:
     """
     Insert new job with status='pending', return job_id
@@ -29,10 +90,7 @@ def create_job() -> int:
     Returns:
         int: The ID of the newly created job
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
+    with db_connection() as conn, conn.cursor() as cursor:
         cursor.execute("""
             INSERT INTO public.job_runs (status, progress)
             VALUES ('pending', 0)
@@ -41,9 +99,6 @@ def create_job() -> int:
         job_id = cursor.fetchone()[0]
         conn.commit()
         return job_id
-    finally:
-        cursor.close()
-        conn.close()
 
 
 def get_job_status(job_id: int) -> Optional[Dict[str, Any]]:
@@ -57,10 +112,7 @@ def get_job_status(job_id: int) -> Optional[Dict[str, Any]]:
         dict: Job data with keys: id, status, progress, progress_message, created_at, completed_at
         None if job not found
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
+    with db_connection() as conn, conn.cursor() as cursor:
         cursor.execute("""
             SELECT id, status, progress, progress_message, created_at, completed_at
             FROM public.job_runs
@@ -79,9 +131,6 @@ def get_job_status(job_id: int) -> Optional[Dict[str, Any]]:
             "created_at": row[4],
             "completed_at": row[5]
         }
-    finally:
-        cursor.close()
-        conn.close()
 
 
 def update_job_status(job_id: int, status: str):
@@ -92,19 +141,13 @@ def update_job_status(job_id: int, status: str):
         job_id: The ID of the job to update
         status: New status value (pending, running, awaiting_review, completed, failed)
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
+    with db_connection() as conn, conn.cursor() as cursor:
         cursor.execute("""
             UPDATE public.job_runs
             SET status = %s
             WHERE id = %s
         """, (status, job_id))
         conn.commit()
-    finally:
-        cursor.close()
-        conn.close()
 
 
 def update_job_progress(job_id: int, progress: int):
@@ -115,19 +158,13 @@ def update_job_progress(job_id: int, progress: int):
         job_id: The ID of the job to update
         progress: Progress value (typically 0-100)
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
+    with db_connection() as conn, conn.cursor() as cursor:
         cursor.execute("""
             UPDATE public.job_runs
             SET progress = %s
             WHERE id = %s
         """, (progress, job_id))
         conn.commit()
-    finally:
-        cursor.close()
-        conn.close()
 
 
 def update_job_progress_message(job_id: int, message: str):
@@ -138,19 +175,13 @@ def update_job_progress_message(job_id: int, message: str):
         job_id: The ID of the job to update
         message: Progress message (e.g., "Processing email 23/50... Running subagent: SKU extraction")
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
+    with db_connection() as conn, conn.cursor() as cursor:
         cursor.execute("""
             UPDATE public.job_runs
             SET progress_message = %s
             WHERE id = %s
         """, (message, job_id))
         conn.commit()
-    finally:
-        cursor.close()
-        conn.close()
 
 
 def update_job_progress_with_message(job_id: int, progress: int, message: str):
@@ -162,10 +193,7 @@ def update_job_progress_with_message(job_id: int, progress: int, message: str):
         progress: Progress value (typically 0-100)
         message: Progress message for user
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
+    with db_connection() as conn, conn.cursor() as cursor:
         cursor.execute("""
             UPDATE public.job_runs
             SET progress = %s,
@@ -173,9 +201,6 @@ def update_job_progress_with_message(job_id: int, progress: int, message: str):
             WHERE id = %s
         """, (progress, message, job_id))
         conn.commit()
-    finally:
-        cursor.close()
-        conn.close()
 
 
 def complete_job(job_id: int):
@@ -185,10 +210,7 @@ def complete_job(job_id: int):
     Args:
         job_id: The ID of the job to complete
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
+    with db_connection() as conn, conn.cursor() as cursor:
         cursor.execute("""
             UPDATE public.job_runs
             SET status = 'completed',
@@ -197,9 +219,6 @@ def complete_job(job_id: int):
             WHERE id = %s
         """, (job_id,))
         conn.commit()
-    finally:
-        cursor.close()
-        conn.close()
 
 
 def fail_job(job_id: int, error_message: str = None):
@@ -213,10 +232,7 @@ def fail_job(job_id: int, error_message: str = None):
     if error_message:
         print(f"[Database] Job {job_id} failed: {error_message}")
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
+    with db_connection() as conn, conn.cursor() as cursor:
         cursor.execute("""
             UPDATE public.job_runs
             SET status = 'failed',
@@ -224,7 +240,4 @@ def fail_job(job_id: int, error_message: str = None):
             WHERE id = %s
         """, (job_id,))
         conn.commit()
-    finally:
-        cursor.close()
-        conn.close()
 
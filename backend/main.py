@@ -406,15 +406,15 @@ def get_failure_summary(job_id: int, regenerate: bool = False):
         # Generate new summary using Anthropic API
         summary = _generate_failure_summary(job_id, failure_contexts)
 
-        # Cache the summary
-        db_helper.save_failure_summary(job_id, summary)
+        # Cache the summary (the stored row carries the database timestamp)
+        saved = db_helper.save_failure_summary(job_id, summary)
 
         return FailureSummaryResponse(
             job_id=job_id,
             has_failures=True,
             failure_count=failure_count,
             summary=summary,
-            generated_at=datetime.utcnow(),
+            generated_at=saved["failure_summary_generated_at"] if saved else datetime.utcnow(),
             is_cached=False
         )
 
@@ -468,8 +468,8 @@ def get_failure_summary_pdf(job_id: int):
         else:
             # Generate new summary
             summary = _generate_failure_summary(job_id, failure_contexts)
-            db_helper.save_failure_summary(job_id, summary)
-            generated_at = datetime.utcnow()
+            saved = db_helper.save_failure_summary(job_id, summary)
+            generated_at = saved["failure_summary_generated_at"] if saved else datetime.utcnow()
 
         # Generate PDF
         pdf_bytes = generate_failure_summary_pdf(
@@ -127,24 +127,13 @@ def export_to_database(orders: List[Dict[str, Any]]) -> Dict[str, Any]:
             logger.info(f"Inserting {len(valid_orders)} valid orders in batch...")
 
             orders_data = [order_data for _, order_data in valid_orders]
-            success = db_helper.insert_orders_batch(orders_data)
+            # job_runs order/line counts are refreshed in the same transaction as the insert
+            job_id = orders_data[0].get("job_id")
+            success = db_helper.insert_orders_batch(orders_data, job_id=job_id)
 
             if success:
                 success_count = len(valid_orders)
                 logger.info(f"Successfully inserted {success_count} orders in batch")
-                
-                # Update job_runs with order and order line counts
-                if orders_data:
-                    job_id = orders_data[0].get("job_id")
-                    if job_id:
-                        try:
-                            update_success = db_helper.update_job_runs_counts(job_id)
-                            if update_success:
-                                logger.info(f"Updated job_runs counts for job_id {job_id}")
-                            else:
-                                logger.warning(f"Failed to update job_runs counts for job_id {job_id}")
-                        except Exception as e:
-                            logger.error(f"Error updating job_runs counts for job_id {job_id}: {e}")
             else:
                 # If batch fails, mark all as failed
                 failed_count = len(valid_orders)
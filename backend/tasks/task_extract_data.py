@@ -17,7 +17,7 @@ from backend.database import (
 from backend.utils.blob_storage import load_json, save_csv, file_exists
 
 # Import subagents
-from backend.subagents.customer_id import extract_customer_id
+from backend.subagents.customer_id import extract_customer_id, extract_sender_email_from_text
 from backend.subagents.sku_extraction import extract_sku_and_quantity
 from backend.subagents.reference_no import extract_reference_no
 from backend.subagents.valve_detection import detect_valve_request
@@ -369,6 +369,24 @@ def extract_data_task(self, job_id: int):
         else:
             print(f"[Task 3] Warning: emails_raw.json not found - subject lines won't be available")
 
+        # Format email content for subagents (matches finalize_text_orders.py format)
+        email_texts = [
+            format_email_content(
+                email_data.get('original_email', {}),
+                email_data.get('full_thread_body', ''),
+                email_data.get('message_id', '') or f"missing_{idx}"
+            )
+            for idx, email_data in enumerate(extracted_emails, 1)
+        ]
+
+        # Look up every sender address in one query so customer ID email fallbacks
+        # are served from the lookup cache instead of one round trip each
+        try:
+            sender_emails = [extract_sender_email_from_text(text) for text in email_texts]
+            get_db_helper().lookup_customers_by_emails([email for email in sender_emails if email])
+        except Exception as e:
+            print(f"[Task 3] Warning: Failed to prefetch email lookups: {e}")
+
         # Step 2: Process each email
         all_orders = []
         all_failure_contexts = []  # Collect failure contexts for summary generation
@@ -379,15 +397,12 @@ def extract_data_task(self, job_id: int):
 
             # Extract email components
             message_id = email_data.get('message_id', '')
-            original_email = email_data.get('original_email', {})
-            full_thread_body = email_data.get('full_thread_body', '')
 
             if not message_id:
                 print(f"[Task 3] Warning: No message_id in extracted email {idx}")
                 message_id = f"missing_{idx}"
 
-            # Format email content for subagents (matches finalize_text_orders.py format)
-            email_text = format_email_content(original_email, full_thread_body, message_id)
+            email_text = email_texts[idx - 1]
 
             try:
                 # Process email (may return multiple order lines and failure contexts)
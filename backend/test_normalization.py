@@ -168,9 +168,84 @@ def test_order_15_case():
     return success
 
 
+# Legal entity suffix forms and the normalized names they produced before the
+# legal entity patterns were fused into one regex (comma + S.L.U. in particular)
+LEGAL_ENTITY_CASES = [
+    ("MATERIALES GARCIA, S.L.U.", "materiales garcia SL."),
+    ("Comercial Lopez, S.L.U", "comercio lopez SL"),
+    ("FERRETERIA PEREZ,S.L.U.", "ferreteria perez SL."),
+    ("Almacenes Soria S.L.U.", "materiales soria SL."),
+    ("Almacenes de Construcción Soria Gamma, S.L", "materiales de construccion soria gamma SL"),
+    ("MATERIALES DE CONSTRUCCION SORIA S.L.", "materiales de construccion soria SL."),
+    ("DISTRIBUIDORA NORTE, S.A.", "distribuidor norte SA."),
+    ("Suministros Levante S.A", "materiales levante SA"),
+    ("Cooperativa Sur S.C.", "cooperativa sur SC."),
+    ("Construcciones Ruiz S.L.L.", "construccion ruiz SLl."),
+]
+
+
+def test_legal_entity_suffixes():
+    """Test that legal entity suffixes normalize as they always have"""
+
+    print("=" * 80)
+    print("Testing Legal Entity Suffix Normalization")
+    print("=" * 80)
+
+    failures = []
+    for business_name, expected in LEGAL_ENTITY_CASES:
+        normalized = normalize_business_name(business_name)
+        status = "[PASS]" if normalized == expected else "[FAIL]"
+        print(f"{status} '{business_name}' -> '{normalized}' (expected '{expected}')")
+        if normalized != expected:
+            failures.append(business_name)
+
+    print()
+    assert not failures, f"Unexpected normalization for: {failures}"
+    return True
+
+
+# Business names with the normalized name and buying group keywords the original
+# (one-pass-per-pattern) normalizer produced: accents, synonyms, spacing, keywords
+BUSINESS_NAME_CASES = [
+    ("  Almacén  Central   de Suministros ", "materiales central de materiales", []),
+    ("DISTRIBUCIONES GENERALIFE MARACENA, S.L.", "distribuidor generalife maracena SL.", []),
+    ("Comercial Ibáñez y Hermanos S.A.", "comercio ibanez y hermanos SA.", []),
+    ("GRUPO GAMMA Cadena Asociación Norte", "grupo gamma cadena asociacion norte", ["gamma", "grupo", "cadena"]),
+    ("Construcciones  Peñalver,S.L", "construccion penalver SL", []),
+    ("FONTANERÍA JOSÉ LÓPEZ SC", "fontaneria jose lopez sc", []),
+    ("almacenes suministros almacen", "materiales materiales materiales", []),
+]
+
+
+def test_business_name_normalization():
+    """Test business name normalization and keyword extraction against known outputs"""
+
+    print("=" * 80)
+    print("Testing Business Name Normalization")
+    print("=" * 80)
+
+    failures = []
+    for business_name, expected_name, expected_keywords in BUSINESS_NAME_CASES:
+        normalized = normalize_business_name(business_name)
+        keywords = extract_buying_group_keywords(business_name)
+        passed = normalized == expected_name and keywords == expected_keywords
+        status = "[PASS]" if passed else "[FAIL]"
+        print(f"{status} '{business_name}' -> '{normalized}' {keywords}")
+        if not passed:
+            failures.append(business_name)
+
+    print()
+    assert not failures, f"Unexpected normalization for: {failures}"
+    return True
+
+
 if __name__ == "__main__":
     try:
-        success = test_order_15_case()
+        success = (
+            test_order_15_case()
+            and test_legal_entity_suffixes()
+            and test_business_name_normalization()
+        )
         sys.exit(0 if success else 1)
     except Exception as e:
         print(f"\n[ERROR]: {e}")
@@ -3,11 +3,24 @@ Anthropic API helper with retry logic and error handling
 """
 import json
 import os
+import random
+import re
 import time
 from typing import Dict, Any, Optional
-from anthropic import Anthropic
+
+import httpx
+from anthropic import Anthropic, RateLimitError
 from .logger import logger
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    from json import loads as _json_loads
+
+# Matches the body of a ```json ... ``` (or bare ``` ... ```) markdown fence; an unterminated
+# fence (e.g. a truncated response) runs to the end of the text
+_FENCE_RE = re.compile(r"```(?:json)?\s*\n?(.*?)(?:```|$)", re.DOTALL)
+
 
 class AnthropicHelper:
     """Wrapper for Anthropic API calls with retry logic"""
@@ -23,16 +36,26 @@ class AnthropicHelper:
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY not found in environment")
 
-        self.client = Anthropic(api_key=self.api_key)
+        # Retry configuration
+        self.max_retries = int(os.getenv("MAX_RETRIES", "3"))
+        self.timeout = int(os.getenv("TIMEOUT_SECONDS", "30"))
+        self.backoff_cap = float(os.getenv("RETRY_BACKOFF_CAP", "30"))
+
+        # One long-lived pooled HTTP client so keep-alive connections are reused across calls
+        self.http_client = httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            timeout=self.timeout,
+        )
+        self.client = Anthropic(
+            api_key=self.api_key,
+            http_client=self.http_client,
+            timeout=self.timeout,
+        )
 
         # Default models from .env or hardcoded
         self.default_model = os.getenv("ANTHROPIC_MODEL_DEFAULT", "claude-sonnet-4-5-20250929")
         self.complex_model = os.getenv("ANTHROPIC_MODEL_COMPLEX", "claude-sonnet-4-5-20250929")
 
-        # Retry configuration
-        self.max_retries = int(os.getenv("MAX_RETRIES", "3"))
-        self.timeout = int(os.getenv("TIMEOUT_SECONDS", "30"))
-
         # Token configuration
         self.max_tokens = int(os.getenv("MAX_TOKENS", "4096"))
 
@@ -56,6 +79,7 @@ class AnthropicHelper:
             response_format: "json" or "text"
             system_message: Optional system message
             max_tokens: Maximum tokens in response (if None, uses default from config)
+            timeout: Per-request timeout override in seconds (if None, uses client timeout)
 
         Returns:
             Parsed response (dict if JSON, str if text)
@@ -65,6 +89,8 @@ class AnthropicHelper:
         """
         model = model or self.default_model
         max_tokens = max_tokens or self.max_tokens
+        # Client-level timeout applies unless the caller overrides it
+        request_options = {"timeout": timeout} if timeout else {}
 
         # Build messages array (Anthropic doesn't include system message here)
         messages = [{"role": "user", "content": prompt}]
@@ -80,42 +106,78 @@ class AnthropicHelper:
                     temperature=temperature,
                     system=system_message if system_message else "",
                     messages=messages,
-                    timeout=timeout or self.timeout,
+                    **request_options,
                 )
 
-                # Extract content from response
-                content = response.content[0].text
-
-                # Parse JSON response
-                if response_format == "json":
-                    try:
-                        return json.loads(content)
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"Failed to parse JSON response: {e}")
-                        logger.debug(f"Raw response: {content}")
-                        # Try to extract JSON from markdown code blocks
-                        if "```json" in content:
-                            json_str = content.split("```json")[1].split("```")[0].strip()
-                            return json.loads(json_str)
-                        elif "```" in content:
-                            json_str = content.split("```")[1].split("```")[0].strip()
-                            return json.loads(json_str)
-                        raise
-
-                # Return text response
-                return {"content": content}
+                return self._parse_response(response, response_format)
 
             except Exception as e:
                 logger.warning(f"Anthropic API error (attempt {attempt}/{self.max_retries}): {e}")
 
                 if attempt < self.max_retries:
-                    wait_time = 2 ** attempt  # Exponential backoff: 2, 4, 8 seconds
-                    logger.info(f"Retrying in {wait_time} seconds...")
+                    wait_time = self._backoff_seconds(attempt, e)
+                    logger.info(f"Retrying in {wait_time:.1f} seconds...")
                     time.sleep(wait_time)
                 else:
                     logger.error(f"All {self.max_retries} attempts failed")
                     raise
 
+    def _parse_response(self, response: Any, response_format: str) -> Dict[str, Any]:
+        """
+        Extract and parse the text content of an API response
+
+        Args:
+            response: Anthropic Message response
+            response_format: "json" or "text"
+
+        Returns:
+            Parsed JSON, or {"content": text} for text responses
+        """
+        content = response.content[0].text
+
+        # Parse JSON response
+        if response_format == "json":
+            try:
+                return _json_loads(content)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Failed to parse JSON response: {e}")
+                logger.debug(f"Raw response: {content}")
+                # Try to extract JSON from markdown code blocks (skip the regex when there is no fence)
+                if "```" in content:
+                    match = _FENCE_RE.search(content)
+                    if match:
+                        return _json_loads(match.group(1).strip())
+                raise
+
+        # Return text response
+        return {"content": content}
+
+    def _backoff_seconds(self, attempt: int, error: Exception) -> float:
+        """
+        Compute wait time before the next retry
+
+        Uses full-jitter exponential backoff capped at backoff_cap, so concurrent
+        workers don't retry in lockstep. On rate limits, waits at least as long
+        as the server's retry-after header.
+
+        Args:
+            attempt: Attempt number that just failed (1-based)
+            error: Exception raised by the failed attempt
+
+        Returns:
+            Seconds to sleep
+        """
+        wait_time = random.uniform(0, min(self.backoff_cap, 2 ** attempt))
+
+        if isinstance(error, RateLimitError):
+            retry_after = error.response.headers.get("retry-after")
+            try:
+                wait_time = max(float(retry_after), wait_time)
+            except (TypeError, ValueError):
+                pass
+
+        return wait_time
+
     def call_default(self, prompt: str, system_message: Optional[str] = None) -> Dict[str, Any]:
         """
         Call with default model (claude-sonnet-4-5-20250929)
@@ -3,10 +3,23 @@ JWT Authentication Utilities
 Port of FD_WebPages backend/src/utils/auth.js to Python
 """
 
+import hashlib
 import os
+import time
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
 
+# Verified token payloads keyed by a blake2b digest of the token: {key: (payload, exp)}
+_verified_tokens = {}
+_VERIFIED_TOKENS_MAX = 1024
+
+
+def _token_cache_key(token: str, jwt_secret: str) -> bytes:
+    """Fast non-reversible cache key; keyed by the secret so rotating it invalidates entries."""
+    return hashlib.blake2b(
+        token.encode(), digest_size=16, key=jwt_secret.encode()[:64]
+    ).digest()
+
 
 def generate_token(payload: dict) -> str:
     """
@@ -80,8 +93,19 @@ def verify_token(token: str) -> dict:
         if not jwt_secret:
             raise ValueError('JWT_SECRET environment variable not set')
 
+        # Skip signature verification for tokens already verified and not yet expired
+        cache_key = _token_cache_key(token, jwt_secret)
+        cached = _verified_tokens.get(cache_key)
+        if cached and time.time() < cached[1]:
+            return dict(cached[0])
+
         # Verify and decode token
         decoded = jwt.decode(token, jwt_secret, algorithms=['HS256'])
+
+        if 'exp' in decoded:
+            if len(_verified_tokens) >= _VERIFIED_TOKENS_MAX:
+                _verified_tokens.clear()
+            _verified_tokens[cache_key] = (dict(decoded), decoded['exp'])
         return decoded
 
     except jwt.ExpiredSignatureError:
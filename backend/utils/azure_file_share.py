@@ -6,9 +6,19 @@ making them instantly accessible to local users via mapped network drive.
 """
 
 import os
-from datetime import datetime
-from azure.storage.fileshare import ShareFileClient, ShareDirectoryClient
-from azure.core.exceptions import ResourceExistsError
+import time
+from datetime import datetime, timedelta
+from azure.storage.fileshare import ShareServiceClient
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+
+# (expires_at, "YYMMDD") - the date string is reused until the next local midnight
+_cached_date = (0.0, "")
+
+# Date folders already created/verified by this process
+_ensured_folders = set()
+
+# Shared service client - share/directory/file clients derived from it reuse its HTTP session
+_share_service = None
 
 
 def get_connection_string() -> str:
@@ -25,6 +35,28 @@ def get_connection_string() -> str:
     return f"DefaultEndpointsProtocol=https;AccountName={account_name};AccountKey={account_key};EndpointSuffix=core.windows.net"
 
 
+def _get_share_service() -> ShareServiceClient:
+    """Get or create the module-level ShareServiceClient."""
+    global _share_service
+    if _share_service is None:
+        _share_service = ShareServiceClient.from_connection_string(
+            get_connection_string(), connection_timeout=10, read_timeout=60
+        )
+    return _share_service
+
+
+def _get_date_str() -> str:
+    """Return today's date as YYMMDD, cached until the next local midnight."""
+    global _cached_date
+    if time.time() < _cached_date[0]:
+        return _cached_date[1]
+    today = datetime.now()
+    next_midnight = datetime.combine(today.date() + timedelta(days=1), datetime.min.time())
+    date_str = today.strftime("%y%m%d")
+    _cached_date = (next_midnight.timestamp(), date_str)
+    return date_str
+
+
 def ensure_date_folder_exists(share_name: str) -> str:
     """
     Create date folder structure (YYMMDD/YYMMDDAI) if it doesn't exist.
@@ -35,16 +67,19 @@ def ensure_date_folder_exists(share_name: str) -> str:
     Returns:
         str: The date folder path (e.g., '251212/251212AI')
     """
-    connection_string = get_connection_string()
-    date_str = datetime.now().strftime("%y%m%d")
+    date_str = _get_date_str()
     parent_folder = date_str
     ai_folder = f"{date_str}AI"
     full_folder_path = f"{parent_folder}/{ai_folder}"
 
+    # Folders only change once a day, so skip the create calls after the first upload
+    if (share_name, full_folder_path) in _ensured_folders:
+        return full_folder_path
+
+    share_client = _get_share_service().get_share_client(share_name)
+
     # Create parent folder (YYMMDD)
-    parent_client = ShareDirectoryClient.from_connection_string(
-        connection_string, share_name, parent_folder
-    )
+    parent_client = share_client.get_directory_client(parent_folder)
     try:
         parent_client.create_directory()
         print(f"[Azure File Share] Created folder: {parent_folder}")
@@ -52,15 +87,14 @@ def ensure_date_folder_exists(share_name: str) -> str:
         pass
 
     # Create AI subfolder (YYMMDDAI)
-    ai_client = ShareDirectoryClient.from_connection_string(
-        connection_string, share_name, full_folder_path
-    )
+    ai_client = share_client.get_directory_client(full_folder_path)
     try:
         ai_client.create_directory()
         print(f"[Azure File Share] Created folder: {full_folder_path}")
     except ResourceExistsError:
         pass
 
+    _ensured_folders.add((share_name, full_folder_path))
     return full_folder_path
 
 
@@ -76,7 +110,6 @@ def upload_email_file(file_content: bytes, filename: str, prefix: str = "TEXT")
     Returns:
         str: Full path to the uploaded file in Azure File Share
     """
-    connection_string = get_connection_string()
     share_name = os.getenv('AZURE_FILE_SHARE')
 
     if not share_name:
@@ -93,10 +126,15 @@ def upload_email_file(file_content: bytes, filename: str, prefix: str = "TEXT")
     file_path = f"{folder_path}/{prefixed_filename}"
 
     # Upload file
-    file_client = ShareFileClient.from_connection_string(
-        connection_string, share_name, file_path
-    )
-    file_client.upload_file(file_content)
+    share_client = _get_share_service().get_share_client(share_name)
+    try:
+        share_client.get_file_client(file_path).upload_file(file_content)
+    except ResourceNotFoundError:
+        # The folder was deleted since we cached it - recreate it and retry once
+        _ensured_folders.discard((share_name, folder_path))
+        folder_path = ensure_date_folder_exists(share_name)
+        file_path = f"{folder_path}/{prefixed_filename}"
+        share_client.get_file_client(file_path).upload_file(file_content)
 
     print(f"[Azure File Share] Uploaded: {file_path}")
 
@@ -6,6 +6,7 @@ Automatically uses Azure if AZURE_STORAGE_CONNECTION_STRING is set, otherwise fa
 import os
 import json
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Optional
 
@@ -16,9 +17,16 @@ AZURE_STORAGE_CONNECTION_STRING = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
 USE_AZURE = bool(AZURE_STORAGE_CONNECTION_STRING)
 CONTAINER_NAME = "text-order-processing-temp"
 
+# Azure Blob batch API accepts at most 256 sub-requests per call
+BLOB_BATCH_SIZE = 256
+BLOB_DELETE_WORKERS = 32
+
 # Local temp directory path
 LOCAL_TEMP_DIR = Path("temp")
 
+# Local directories already created by this process (cleared when temp dirs are removed)
+_ensured_dirs: set = set()
+
 
 def _get_blob_container():
     """Get Azure Blob container client (lazy import to avoid errors when not using Azure)."""
@@ -40,6 +48,14 @@ def _get_blob_name(filename: str, job_id: Optional[int] = None) -> str:
     return filename
 
 
+def _ensure_dir(path: Path):
+    """Create a local directory once per process instead of on every write."""
+    key = str(path)
+    if key not in _ensured_dirs:
+        path.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(key)
+
+
 def _get_local_path(filename: str, job_id: Optional[int] = None) -> Path:
     """Generate local file path with optional job_id prefix."""
     if job_id:
@@ -56,22 +72,25 @@ def ensure_temp_dir(job_id: Optional[int] = None) -> Path:
         temp_path = LOCAL_TEMP_DIR / f"job_{job_id}"
     else:
         temp_path = LOCAL_TEMP_DIR
-    temp_path.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(temp_path)
     return temp_path
 
 
 def cleanup_temp_dir():
     """Clean up the contents of the temp directory (local storage only)."""
+    _ensured_dirs.clear()
     if LOCAL_TEMP_DIR.exists():
         # Delete contents instead of the directory itself to avoid Windows permission errors
-        for item in LOCAL_TEMP_DIR.iterdir():
-            try:
-                if item.is_file():
-                    item.unlink()
-                elif item.is_dir():
-                    shutil.rmtree(item)
-            except PermissionError:
-                print(f"Warning: Could not delete {item} - skipping")
+        # scandir's DirEntry caches file type, avoiding a stat() per entry
+        with os.scandir(LOCAL_TEMP_DIR) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file(follow_symlinks=False):
+                        os.unlink(entry.path)
+                    elif entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                except PermissionError:
+                    print(f"Warning: Could not delete {entry.path} - skipping")
     else:
         LOCAL_TEMP_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -97,7 +116,7 @@ def save_json(data: Any, filename: str, job_id: Optional[int] = None) -> str:
         return f"blob://{CONTAINER_NAME}/{blob_name}"
     else:
         local_path = _get_local_path(filename, job_id)
-        local_path.parent.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(local_path.parent)
         with open(local_path, 'w', encoding='utf-8') as f:
             f.write(json_content)
         return str(local_path)
@@ -154,7 +173,7 @@ def save_csv(df: pd.DataFrame, filename: str, job_id: Optional[int] = None) -> s
         return f"blob://{CONTAINER_NAME}/{blob_name}"
     else:
         local_path = _get_local_path(filename, job_id)
-        local_path.parent.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(local_path.parent)
         with open(local_path, 'w', encoding='utf-8', newline='') as f:
             f.write(csv_content)
         return str(local_path)
@@ -191,6 +210,15 @@ def load_csv(filename: str, job_id: Optional[int] = None) -> pd.DataFrame:
         return pd.read_csv(local_path)
 
 
+def _delete_blob_if_exists(container, blob_name: str):
+    """Delete a single blob, ignoring one that is already gone."""
+    from azure.core.exceptions import ResourceNotFoundError
+    try:
+        container.delete_blob(blob_name)
+    except ResourceNotFoundError:
+        pass
+
+
 def cleanup_job_files(job_id: int):
     """
     Delete all files for a specific job.
@@ -199,13 +227,30 @@ def cleanup_job_files(job_id: int):
         job_id: Job ID to clean up
     """
     if USE_AZURE:
+        from azure.core.exceptions import HttpResponseError
         container = _get_blob_container()
         prefix = f"job_{job_id}/"
-        blobs = container.list_blobs(name_starts_with=prefix)
-        for blob in blobs:
-            container.delete_blob(blob.name)
+        names = [blob.name for blob in container.list_blobs(name_starts_with=prefix)]
+        for start in range(0, len(names), BLOB_BATCH_SIZE):
+            chunk = names[start:start + BLOB_BATCH_SIZE]
+            try:
+                # One batched HTTP request per chunk instead of one per blob
+                responses = container.delete_blobs(*chunk, raise_on_any_failure=False)
+                # Sub-responses come back in request order; 404 means already deleted
+                failed = [
+                    name for name, response in zip(chunk, responses)
+                    if not 200 <= response.status_code < 300 and response.status_code != 404
+                ]
+            except HttpResponseError:
+                # Batch API unavailable (e.g. emulator) - delete the whole chunk one by one
+                failed = chunk
+            if failed:
+                # Concurrent single deletes for whatever the batch didn't remove
+                with ThreadPoolExecutor(max_workers=BLOB_DELETE_WORKERS) as executor:
+                    list(executor.map(lambda name: _delete_blob_if_exists(container, name), failed))
     else:
         job_dir = LOCAL_TEMP_DIR / f"job_{job_id}"
+        _ensured_dirs.discard(str(job_dir))
         if job_dir.exists():
             shutil.rmtree(job_dir)
 
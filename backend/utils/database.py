@@ -2,23 +2,216 @@
 PostgreSQL database utilities
 """
 import os
-from typing import List, Tuple, Optional, Dict, Any
-import json
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from pathlib import Path
+from typing import List, Tuple, Optional, Dict, Any, NamedTuple, Iterator
+import numpy as np
 from rapidfuzz import fuzz
+from rapidfuzz.process import cdist
 import psycopg
+from psycopg.types.json import Jsonb, set_json_loads
 from .logger import logger
 from .text_normalizer import (
-    remove_accents,
+    lower_and_remove_accents,
     normalize_business_name,
+    normalize_personal_name,
     extract_buying_group_keywords,
+    is_personal_name,
     calculate_boosted_similarity,
-    calculate_jaro_winkler_similarity
+    calculate_boosted_similarity_vec,
+    calculate_jaro_winkler_similarity,
+    calculate_weighted_token_similarity
 )
+from .spanish_business_synonyms import BUYING_GROUP_KEYWORDS
+
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib serializer
+    from json import dumps as _json_dumps, loads as _json_loads
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize values neither JSON encoder handles natively (NUMERIC columns come back as Decimal)"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dump_jsonb(obj: Any):
+    """Serialize a value for a jsonb parameter"""
+    return _json_dumps(obj, default=_json_default)
+
+# On-disk copy of the normalized customer cache, reused across process restarts.
+# It is a pickle, so it lives in a directory only this user can write (backend/cache,
+# created with mode 0700) and is only loaded if this user owns it (see _open_private_file)
+CUSTOMER_CACHE_PATH = Path(
+    os.getenv("CUSTOMER_CACHE_PATH", Path(__file__).parent.parent / "cache" / "customer_cache.pkl")
+)
+
+# Bump when the cache structure or name normalization changes to invalidate stored caches
+CUSTOMER_CACHE_FORMAT_VERSION = 4
+
+# Largest amount calculate_weighted_token_similarity can add to a base score
+# (business boosts are computed exactly from keyword counts)
+_MAX_PERSONAL_BOOST = 0.06
+
+# Largest amount calculate_weighted_token_similarity can subtract (given-name-only matches)
+_MAX_PERSONAL_PENALTY = 0.04
+
+
+def _open_private_file(path: Path):
+    """
+    Open a file for reading only if it belongs to this user and nobody else can write it.
+
+    Checked on the open file descriptor, so the file can't be swapped after the check.
+
+    Raises:
+        PermissionError: If the file is owned by another user or group/world-writable
+    """
+    f = open(path, "rb")
+    try:
+        # Ownership is only meaningful on POSIX (os.getuid is missing on Windows)
+        if hasattr(os, "getuid"):
+            st = os.fstat(f.fileno())
+            if st.st_uid != os.getuid() or st.st_mode & 0o022:
+                raise PermissionError(f"{path} is not owned by this user or is writable by others")
+        return f
+    except BaseException:
+        f.close()
+        raise
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern repeated DB strings so duplicates share one object (None passes through)"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _jaro_winkler_upper_bounds(lengths1: np.ndarray, lengths2: np.ndarray, prefix_weight: float = 0.15) -> np.ndarray:
+    """
+    Upper bounds on Jaro-Winkler similarity from string lengths alone.
+
+    At most min(len1, len2) characters can match, which caps the Jaro score;
+    the Winkler prefix bonus covers at most 4 characters.
+
+    Args:
+        lengths1: Lengths of the first strings (broadcast against lengths2)
+        lengths2: Lengths of the second strings
+        prefix_weight: Jaro-Winkler prefix weight
+
+    Returns:
+        Array of upper bounds (1.0 where either string is empty)
+    """
+    shortest = np.minimum(lengths1, lengths2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        jaro_bounds = (shortest / lengths1 + shortest / lengths2 + 1.0) / 3.0
+    # Small margin so float rounding never makes the bound lower than the real score
+    bounds = np.minimum(jaro_bounds + 4 * prefix_weight * (1.0 - jaro_bounds) + 1e-9, 1.0)
+    return np.where(shortest == 0, 1.0, bounds)
+
+
+def _keyword_flags(keywords: List[str]) -> List[int]:
+    """One 0/1 flag per BUYING_GROUP_KEYWORDS entry, so matched keyword counts are a dot product"""
+    return [int(keyword in keywords) for keyword in BUYING_GROUP_KEYWORDS]
+
+
+def _normalize_customer_name(db_customer_name: str) -> Tuple[str, bool, List[str]]:
+    """
+    Normalize one customer name for the fuzzy matching cache.
+
+    Args:
+        db_customer_name: Customer name as stored in public.clients
+
+    Returns:
+        Tuple of (normalized name, is_personal, buying group keywords)
+    """
+    # Step 1: Basic normalization (lowercase, remove accents)
+    db_name_clean = lower_and_remove_accents(db_customer_name.strip())
+
+    # Step 2: Detect if personal vs business name
+    is_personal = is_personal_name(db_name_clean)
+
+    # Step 3: Apply appropriate normalization
+    if is_personal:
+        # Personal name: normalize gendered names + sort tokens
+        return normalize_personal_name(db_name_clean), True, []
+
+    # Business name: apply synonym + legal entity normalization,
+    # then extract buying group keywords
+    return normalize_business_name(db_name_clean), False, extract_buying_group_keywords(db_name_clean)
+
+
+class _CustomerCache(NamedTuple):
+    """
+    Normalized customer data as parallel columns (structure of arrays, in cache order)
+
+    Column i of every field describes the same customer, so matching can index
+    straight into lists/arrays instead of looking up a dict per candidate.
+    """
+    customer_ids: List[int]
+    originals: List[str]
+    normalized: List[str]
+    tokens_sorted: List[str]
+    keywords: List[List[str]]
+    keywords_fs: List[frozenset]
+    keyword_flags: np.ndarray
+    name_lengths: np.ndarray
+    is_personal: np.ndarray
+
+    @classmethod
+    def from_customers(cls, customers: Dict[int, Dict[str, Any]]) -> "_CustomerCache":
+        """Build the columnar cache from _initialize_customer_cache() output"""
+        rows = customers.values()
+        return cls(
+            customer_ids=list(customers),
+            originals=[row["original"] for row in rows],
+            normalized=[row["normalized"] for row in rows],
+            tokens_sorted=[row["tokens_sorted"] for row in rows],
+            keywords=[row["keywords"] for row in rows],
+            keywords_fs=[row["keywords_fs"] for row in rows],
+            keyword_flags=np.array(
+                [_keyword_flags(row["keywords"]) for row in rows], dtype=np.int32
+            ).reshape(len(rows), len(BUYING_GROUP_KEYWORDS)),
+            name_lengths=np.array([row["nlen"] for row in rows], dtype=np.int32),
+            is_personal=np.array([row["is_personal"] for row in rows], dtype=bool),
+        )
 
 
 class DatabaseHelper:
     """Helper for PostgreSQL database operations"""
 
+    # Cache for normalized customer data, shared by all instances in the process
+    # (populated on first fuzzy_match_customer call). Built from rows of the form:
+    # {
+    #     customer_id: {
+    #         "original": str,          # Original DB name (e.g., "BARROSO MORALES MARIA ANTONIA")
+    #         "normalized": str,        # Normalized name (e.g., "antonio barroso maria morales")
+    #         "tokens_sorted": str,     # Deduplicated, sorted tokens of the normalized name
+    #         "nlen": int,              # Length of the normalized name
+    #         "keywords": list,         # Buying group keywords (e.g., ["gamma"])
+    #         "keywords_fs": frozenset, # Same keywords as a frozenset for fast intersection
+    #         "is_personal": bool,      # True if personal name, False if business name
+    #     }
+    # }
+    _GLOBAL_CUSTOMER_CACHE: Optional[_CustomerCache] = None
+
+    _CACHE_LOCK = threading.Lock()
+
+    # LRU of fuzzy_match_customer results keyed by (tuple(potential_names), threshold):
+    # the same sender tends to produce the same candidate names order after order
+    _MATCH_RESULT_CACHE: "OrderedDict[Tuple[Tuple[str, ...], float], Dict[str, Any]]" = OrderedDict()
+    _MATCH_RESULT_CACHE_SIZE = int(os.getenv("CUSTOMER_MATCH_CACHE_SIZE", "10000"))
+
+    # LRU of lookup_customer_by_email results keyed by lowercased address, each entry
+    # stored as (expires_at, result) so mapping changes show up after the TTL
+    _EMAIL_LOOKUP_CACHE: "OrderedDict[str, Tuple[float, Optional[Tuple[int, str]]]]" = OrderedDict()
+    _EMAIL_LOOKUP_CACHE_SIZE = int(os.getenv("EMAIL_LOOKUP_CACHE_SIZE", "10000"))
+    _EMAIL_LOOKUP_CACHE_TTL = float(os.getenv("EMAIL_LOOKUP_CACHE_TTL", "300"))
+
     def __init__(self, database_url: Optional[str] = None):
         """
         Initialize database helper
@@ -32,25 +225,62 @@ class DatabaseHelper:
 
         self.connection = None
 
-        # Cache for normalized customer data (populated on first fuzzy_match_customer call)
-        # Structure: {
-        #     customer_id: {
-        #         "original": str,          # Original DB name (e.g., "BARROSO MORALES MARIA ANTONIA")
-        #         "normalized": str,        # Normalized name (e.g., "antonio barroso maria morales")
-        #         "keywords": list,         # Buying group keywords (e.g., ["gamma"])
-        #         "is_personal": bool,      # True if personal name, False if business name
-        #     }
-        # }
-        self._normalized_customers_cache: Optional[Dict[int, Dict[str, Any]]] = None
+        # Statements executed this many times on a connection are prepared server-side,
+        # so repeat queries (e.g. query_options_table) skip parse/plan.
+        # Set DB_PREPARE_THRESHOLD=none to disable (e.g. behind an old pgbouncer in transaction mode)
+        prepare_threshold = os.getenv("DB_PREPARE_THRESHOLD", "2")
+        self.prepare_threshold = None if prepare_threshold.lower() == "none" else int(prepare_threshold)
+
+        # Small reference tables, loaded on first use (see invalidate_reference_caches)
+        self._product_families_cache: Optional[List[Tuple[str, str]]] = None
+        self._color_codes_cache: Optional[List[Tuple[str, str]]] = None
+
+    @classmethod
+    def invalidate_customer_cache(cls) -> None:
+        """Drop the shared customer cache so the next match reloads it from the database"""
+        with cls._CACHE_LOCK:
+            cls._GLOBAL_CUSTOMER_CACHE = None
+            cls._MATCH_RESULT_CACHE.clear()
+
+    @classmethod
+    def clear_email_cache(cls) -> None:
+        """Drop cached email lookups (call after changing email_lookup_for_customer)"""
+        with cls._CACHE_LOCK:
+            cls._EMAIL_LOOKUP_CACHE.clear()
+
+    def invalidate_reference_caches(self) -> None:
+        """Drop cached product families and color codes so the next call re-reads them"""
+        self._product_families_cache = None
+        self._color_codes_cache = None
+
+    def _ensure_customer_cache(self) -> _CustomerCache:
+        """
+        Get the shared customer cache, building it on first use (double-checked locking).
+
+        Returns:
+            Shared _CustomerCache
+        """
+        customer_cache = DatabaseHelper._GLOBAL_CUSTOMER_CACHE
+        if customer_cache is not None:
+            return customer_cache
+
+        with DatabaseHelper._CACHE_LOCK:
+            if DatabaseHelper._GLOBAL_CUSTOMER_CACHE is None:
+                DatabaseHelper._GLOBAL_CUSTOMER_CACHE = _CustomerCache.from_customers(
+                    self._initialize_customer_cache()
+                )
+            return DatabaseHelper._GLOBAL_CUSTOMER_CACHE
 
     def connect(self):
         """Establish database connection"""
         if self.connection is None or self.connection.closed:
             try:
-                self.connection = psycopg.connect(self.database_url)
+                self.connection = psycopg.connect(self.database_url, prepare_threshold=self.prepare_threshold)
+                # Parse json/jsonb columns (e.g. failure_context) with the faster loader
+                set_json_loads(_json_loads, self.connection)
                 logger.info("Database connection established")
             except Exception as e:
-                logger.error(f"Database connection failed: {e}")
+                logger.error("Database connection failed: %s", e)
                 raise
 
     def close(self):
@@ -68,13 +298,21 @@ class DatabaseHelper:
         """Context manager exit"""
         self.close()
 
-    def execute_query(self, query: str, params: tuple = None) -> List[tuple]:
+    def _prepare_flag(self, prepare: Optional[bool]) -> Optional[bool]:
+        """Resolve a per-call prepare request, never preparing when DB_PREPARE_THRESHOLD=none"""
+        if self.prepare_threshold is None:
+            return False
+        return prepare
+
+    def execute_query(self, query: str, params: tuple = None, prepare: Optional[bool] = None) -> List[tuple]:
         """
         Execute a SELECT query and return results
 
         Args:
             query: SQL query
             params: Query parameters
+            prepare: True to prepare the statement on first use instead of waiting
+                for prepare_threshold executions (None keeps the connection default)
 
         Returns:
             List of result tuples
@@ -82,32 +320,38 @@ class DatabaseHelper:
         self.connect()
         try:
             with self.connection.cursor() as cursor:
-                cursor.execute(query, params)
+                cursor.execute(query, params, prepare=self._prepare_flag(prepare))
                 return cursor.fetchall()
         except Exception as e:
-            logger.error(f"Query execution failed: {e}")
-            logger.debug(f"Query: {query}")
-            logger.debug(f"Params: {params}")
+            logger.error("Query execution failed: %s", e)
+            logger.debug("Query: %s", query)
+            logger.debug("Params: %s", params)
             raise
 
-    def execute_insert(self, query: str, params: tuple = None) -> None:
+    def execute_insert(self, query: str, params: tuple = None, prepare: Optional[bool] = None) -> Optional[tuple]:
         """
         Execute an INSERT/UPDATE query
 
         Args:
             query: SQL query
             params: Query parameters
+            prepare: True to prepare the statement on first use (see execute_query)
+
+        Returns:
+            First row produced by a RETURNING clause, or None
         """
         self.connect()
         try:
             with self.connection.cursor() as cursor:
-                cursor.execute(query, params)
+                cursor.execute(query, params, prepare=self._prepare_flag(prepare))
+                row = cursor.fetchone() if cursor.description else None
                 self.connection.commit()
+                return row
         except Exception as e:
             self.connection.rollback()
-            logger.error(f"Insert/update failed: {e}")
-            logger.debug(f"Query: {query}")
-            logger.debug(f"Params: {params}")
+            logger.error("Insert/update failed: %s", e)
+            logger.debug("Query: %s", query)
+            logger.debug("Params: %s", params)
             raise
 
     def get_all_customers(self) -> List[Tuple[int, str]]:
@@ -120,18 +364,57 @@ class DatabaseHelper:
         query = "SELECT customerid, customer FROM public.clients ORDER BY customer"
         try:
             results = self.execute_query(query)
-            logger.info(f"Retrieved {len(results)} customers from database")
+            logger.info("Retrieved %s customers from database", len(results))
             return results
         except Exception as e:
-            logger.error(f"Failed to retrieve customers: {e}")
+            logger.error("Failed to retrieve customers: %s", e)
+            raise
+
+    def iter_all_customers(self, batch_size: int = 5000) -> Iterator[Tuple[int, str]]:
+        """
+        Stream all customers from public.clients through a server-side cursor
+
+        Rows arrive batch_size at a time, so callers can start processing before
+        the whole table is transferred and never hold the full result buffer.
+
+        Args:
+            batch_size: Rows fetched per round trip
+
+        Yields:
+            (customerid, customer_name) tuples
+        """
+        query = "SELECT customerid, customer FROM public.clients ORDER BY customer"
+        self.connect()
+        count = 0
+        failed = False
+        try:
+            with self.connection.cursor(name="cust_cursor") as cursor:
+                cursor.itersize = batch_size
+                cursor.execute(query)
+                for row in cursor:
+                    count += 1
+                    yield row
+        except Exception as e:
+            failed = True
+            logger.error("Failed to retrieve customers: %s", e)
             raise
+        finally:
+            # End the transaction the server-side cursor ran in, also when the
+            # caller stops iterating early, so the connection isn't left idle in it
+            if failed:
+                self.connection.rollback()
+            else:
+                self.connection.commit()
+        logger.info("Retrieved %s customers from database", count)
 
     def _initialize_customer_cache(self) -> Dict[int, Dict[str, Any]]:
         """
         Initialize in-memory cache of normalized customer data.
 
-        Called once on first fuzzy_match_customer() call.
-        Cache persists for lifetime of DatabaseHelper instance.
+        Called once per process on first fuzzy_match_customer() call.
+        Cache is shared by all DatabaseHelper instances, and is also stored on
+        disk (CUSTOMER_CACHE_PATH) keyed by a fingerprint of public.clients so new
+        processes can skip normalization when the customers table is unchanged.
 
         Performance:
         - One-time cost: ~500ms for 4,724 customers
@@ -141,51 +424,109 @@ class DatabaseHelper:
         Returns:
             Dictionary mapping customer_id to normalized data
         """
-        from .text_normalizer import (
-            remove_accents,
-            normalize_business_name,
-            normalize_personal_name,
-            extract_buying_group_keywords,
-            is_personal_name
-        )
+        version_key = self._get_customer_cache_version()
+        cache = self._load_customer_cache_from_disk(version_key)
+        if cache is not None:
+            return cache
 
         logger.info("Initializing customer normalization cache...")
         cache = {}
 
-        all_customers = self.get_all_customers()
-
-        for customer_id, db_customer_name in all_customers:
-            # Step 1: Basic normalization (lowercase, remove accents)
-            db_name_clean = remove_accents(db_customer_name.lower().strip())
-
-            # Step 2: Detect if personal vs business name
-            is_personal = is_personal_name(db_name_clean)
+        # Names are normalized row by row as they stream in from the server
+        customer_rows = self.iter_all_customers()
+        normalized_rows = ((row, _normalize_customer_name(row[1])) for row in customer_rows)
 
-            # Step 3: Apply appropriate normalization
-            if is_personal:
-                # Personal name: normalize gendered names + sort tokens
-                db_name_normalized = normalize_personal_name(db_name_clean)
-            else:
-                # Business name: apply synonym + legal entity normalization
-                db_name_normalized = normalize_business_name(db_name_clean)
-
-            # Step 4: Extract buying group keywords (for business names only)
-            db_keywords = extract_buying_group_keywords(db_name_clean) if not is_personal else []
-
-            # Step 5: Store in cache
+        for (customer_id, db_customer_name), (db_name_normalized, is_personal, db_keywords) in normalized_rows:
             cache[customer_id] = {
-                "original": db_customer_name,
-                "normalized": db_name_normalized,
+                "original": _intern(db_customer_name),
+                "normalized": _intern(db_name_normalized),
+                # Deduplicated, sorted tokens - token_set_ratio only depends on the token set,
+                # so scoring this pre-sorted form skips re-sorting the DB side on every call
+                "tokens_sorted": _intern(" ".join(sorted(set(db_name_normalized.split())))),
+                "nlen": len(db_name_normalized),
                 "keywords": db_keywords,
+                "keywords_fs": frozenset(db_keywords),
                 "is_personal": is_personal,
             }
 
-        logger.info(f"Customer cache initialized: {len(cache)} customers cached")
-        logger.info(f"  - Personal names: {sum(1 for v in cache.values() if v['is_personal'])}")
-        logger.info(f"  - Business names: {sum(1 for v in cache.values() if not v['is_personal'])}")
+        logger.info("Customer cache initialized: %s customers cached", len(cache))
+        logger.info("  - Personal names: %s", sum(1 for v in cache.values() if v['is_personal']))
+        logger.info("  - Business names: %s", sum(1 for v in cache.values() if not v['is_personal']))
+
+        self._save_customer_cache_to_disk(version_key, cache)
+        return cache
+
+    def _get_customer_cache_version(self) -> Optional[tuple]:
+        """
+        Get a cheap fingerprint of public.clients used to validate the on-disk cache.
+
+        Returns:
+            Tuple of (format version, row count, max customerid, md5 of ids and names),
+            or None if the fingerprint query fails
+        """
+        query = """
+            SELECT COUNT(*),
+                   MAX(customerid),
+                   md5(string_agg(customerid::text || ':' || customer, ',' ORDER BY customerid))
+            FROM public.clients
+        """
+        try:
+            return (CUSTOMER_CACHE_FORMAT_VERSION,) + tuple(self.execute_query(query)[0])
+        except Exception as e:
+            # Clear the aborted transaction so the customer query that follows can still run
+            if self.connection and not self.connection.closed:
+                self.connection.rollback()
+            logger.warning("Could not fingerprint customers table, skipping disk cache: %s", e)
+            return None
+
+    def _load_customer_cache_from_disk(self, version_key: Optional[tuple]) -> Optional[Dict[int, Dict[str, Any]]]:
+        """
+        Load the normalized customer cache from disk if it matches the current DB fingerprint.
+
+        Args:
+            version_key: Fingerprint from _get_customer_cache_version()
+
+        Returns:
+            Cached customer data, or None if missing, stale or unreadable
+        """
+        if version_key is None or not CUSTOMER_CACHE_PATH.exists():
+            return None
+
+        try:
+            with _open_private_file(CUSTOMER_CACHE_PATH) as f:
+                stored_key, cache = pickle.load(f)
+        except Exception as e:
+            logger.warning("Could not read customer cache file %s: %s", CUSTOMER_CACHE_PATH, e)
+            return None
+
+        if stored_key != version_key:
+            logger.info("Customer cache file is stale, rebuilding")
+            return None
 
+        logger.info("Customer cache loaded from %s: %s customers cached", CUSTOMER_CACHE_PATH, len(cache))
         return cache
 
+    def _save_customer_cache_to_disk(self, version_key: Optional[tuple], cache: Dict[int, Dict[str, Any]]) -> None:
+        """
+        Write the normalized customer cache to disk (atomically) for later processes.
+
+        Args:
+            version_key: Fingerprint from _get_customer_cache_version()
+            cache: Normalized customer data
+        """
+        if version_key is None:
+            return
+
+        try:
+            CUSTOMER_CACHE_PATH.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            temp_path = CUSTOMER_CACHE_PATH.with_name(f"{CUSTOMER_CACHE_PATH.name}.{os.getpid()}.tmp")
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((version_key, cache), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, CUSTOMER_CACHE_PATH)
+        except Exception as e:
+            logger.warning("Could not write customer cache file %s: %s", CUSTOMER_CACHE_PATH, e)
+
     def fuzzy_match_customer(
         self,
         potential_names: List[str],
@@ -211,16 +552,6 @@ class DatabaseHelper:
             - threshold_used: float - The threshold that was applied
             - matched_input: str - The input name that matched best
         """
-        from .text_normalizer import (
-            remove_accents,
-            normalize_business_name,
-            normalize_personal_name,
-            extract_buying_group_keywords,
-            calculate_boosted_similarity,
-            calculate_weighted_token_similarity,
-            is_personal_name
-        )
-
         # Default match details for when no match is found
         match_details = {
             "best_score": 0.0,
@@ -234,13 +565,99 @@ class DatabaseHelper:
             logger.warning("No potential customer names provided for fuzzy matching")
             return None, None, match_details
 
-        # Initialize cache on first call (lazy initialization)
-        if self._normalized_customers_cache is None:
-            self._normalized_customers_cache = self._initialize_customer_cache()
+        # Initialize shared cache on first call (lazy initialization)
+        customer_cache = self._ensure_customer_cache()
+
+        cache_key = (tuple(potential_names), threshold)
+        with self._CACHE_LOCK:
+            cached = self._MATCH_RESULT_CACHE.get(cache_key)
+            if cached is not None:
+                self._MATCH_RESULT_CACHE.move_to_end(cache_key)
+
+        if cached is None:
+            cached = self._find_best_customer_match(customer_cache, potential_names, threshold)
+            with self._CACHE_LOCK:
+                # Skip storing if the customer cache was invalidated while matching
+                if self._GLOBAL_CUSTOMER_CACHE is customer_cache:
+                    self._MATCH_RESULT_CACHE[cache_key] = cached
+                    if len(self._MATCH_RESULT_CACHE) > self._MATCH_RESULT_CACHE_SIZE:
+                        self._MATCH_RESULT_CACHE.popitem(last=False)
+
+        # Hand out a copy so callers can't mutate the cached entry
+        match_details = dict(cached, keywords_matched=list(cached["keywords_matched"]))
+        best_customer_id = match_details["best_match_id"]
+        best_customer_name = match_details["best_match_name"]
+        best_match = match_details["matched_input"]
+        best_score = match_details["best_score"]
+        best_base_score = match_details["base_score"]
+        best_boost = match_details["buying_group_boost"]
+        best_keywords_matched = match_details["keywords_matched"]
+
+        # Return best match if above threshold
+        if best_score >= threshold:
+            # Enhanced logging with normalization details
+            if best_boost > 0:
+                logger.info(
+                    "Fuzzy match found: '%s' -> '%s' "
+                    "(ID: %s, base_score: %.2f, "
+                    "boost: +%.2f, final_score: %.2f, "
+                    "keywords_matched: %s)",
+                    best_match, best_customer_name,
+                    best_customer_id, best_base_score,
+                    best_boost, best_score,
+                    best_keywords_matched
+                )
+            else:
+                logger.info(
+                    "Fuzzy match found: '%s' -> '%s' "
+                    "(ID: %s, score: %.2f)",
+                    best_match, best_customer_name,
+                    best_customer_id, best_score
+                )
+            return best_customer_id, best_customer_name, match_details
+        else:
+            # Enhanced logging for failures
+            if best_boost > 0:
+                logger.warning(
+                    "No fuzzy match found for: %s "
+                    "(base_score: %.2f, boost: +%.2f, "
+                    "final_score: %.2f, threshold: %s, "
+                    "closest match: '%s' ID: %s, "
+                    "keywords_matched: %s)",
+                    potential_names,
+                    best_base_score, best_boost,
+                    best_score, threshold,
+                    best_customer_name, best_customer_id,
+                    best_keywords_matched
+                )
+            else:
+                logger.warning(
+                    "No fuzzy match found for: %s "
+                    "(best score: %.2f, threshold: %s, "
+                    "closest match: '%s' ID: %s)",
+                    potential_names,
+                    best_score, threshold,
+                    best_customer_name, best_customer_id
+                )
+            return None, None, match_details
+
+    def _find_best_customer_match(
+        self,
+        customer_cache: _CustomerCache,
+        potential_names: List[str],
+        threshold: float
+    ) -> Dict[str, Any]:
+        """
+        Score potential_names against every cached customer and pick the best match.
 
-        # Use cached data
-        cache = self._normalized_customers_cache
+        Args:
+            customer_cache: Shared customer cache to match against
+            potential_names: Non-empty list of potential customer names
+            threshold: Minimum similarity score (0.0 to 1.0)
 
+        Returns:
+            match_details dict as described in fuzzy_match_customer
+        """
         best_match = None
         best_score = 0.0
         best_customer_id = None
@@ -249,10 +666,11 @@ class DatabaseHelper:
         best_boost = 0.0
         best_keywords_matched = []
 
-        # Try to match each potential name against all customers (using cache)
+        # Normalize each input once: lowercase, strip whitespace, remove accents,
+        # then apply personal or business normalization
+        queries = []
         for potential_name in potential_names:
-            # Normalize input: lowercase, strip whitespace, remove accents
-            potential_name_clean = remove_accents(potential_name.lower().strip())
+            potential_name_clean = lower_and_remove_accents(potential_name.strip())
 
             # Detect if input is personal vs business name
             potential_is_personal = is_personal_name(potential_name_clean)
@@ -265,75 +683,148 @@ class DatabaseHelper:
                 potential_name_normalized = normalize_business_name(potential_name_clean)
                 potential_keywords = extract_buying_group_keywords(potential_name_clean)
 
-            # Match against all cached customers
-            for customer_id, cached_data in cache.items():
-                db_name_normalized = cached_data["normalized"]
-                db_keywords = cached_data["keywords"]
-                db_customer_name = cached_data["original"]
-                db_is_personal = cached_data["is_personal"]
-
-                # Calculate base similarity using dual scoring strategy:
-                # 1. token_set_ratio: excels at word order variations and multi-word matches
-                # 2. Jaro-Winkler: excels at character-level typos and abbreviations
-                #
-                # Conservative approach: Only use Jaro-Winkler as a boost when token score
-                # is already reasonably close (>=70%), to avoid false positives from
-                # unrelated names that happen to share character patterns.
-                token_score = fuzz.token_set_ratio(
+            queries.append((
+                potential_name,
+                potential_name_normalized,
+                potential_is_personal,
+                potential_keywords,
+                frozenset(potential_keywords),
+            ))
+
+        # Score every (input, customer) pair with token_set_ratio in a single C-level call
+        # Rows follow potential_names, columns follow the cache order
+        token_scores = cdist(
+            [" ".join(sorted(set(query[1].split()))) for query in queries],
+            customer_cache.tokens_sorted,
+            scorer=fuzz.token_set_ratio,
+            dtype=np.float64,
+            workers=-1,
+        ) / 100.0
+
+        # Only same-type pairs (personal/personal or business/business) are boosted,
+        # so cross-type pairs are bounded by their base score
+        query_is_personal = np.array([query[2] for query in queries], dtype=bool)
+        same_type = query_is_personal[:, None] == customer_cache.is_personal[None, :]
+        personal_pairs = same_type & query_is_personal[:, None]
+        business_pairs = same_type & ~query_is_personal[:, None]
+
+        # Buying group keywords each pair has in common, which fixes the business boost
+        query_keyword_flags = np.array(
+            [_keyword_flags(query[3]) for query in queries], dtype=np.int32
+        ).reshape(len(queries), len(BUYING_GROUP_KEYWORDS))
+        matched_counts = query_keyword_flags @ customer_cache.keyword_flags.T
+
+        # Lower bound on each pair's final score: boosting never lowers the base score
+        # except for the personal given-name penalty
+        score_floors = np.where(
+            business_pairs,
+            calculate_boosted_similarity_vec(token_scores, matched_counts),
+            token_scores - np.where(personal_pairs, _MAX_PERSONAL_PENALTY, 0.0),
+        )
+        score_floor = score_floors.max() if score_floors.size else 0.0
+
+        # Upper bound on each pair's final score: Jaro-Winkler is capped by the two
+        # string lengths and only applies when token score >= 0.70
+        query_lengths = np.array([len(query[1]) for query in queries], dtype=np.int64)
+        jaro_bounds = _jaro_winkler_upper_bounds(query_lengths[:, None], customer_cache.name_lengths[None, :])
+        jaro_eligible = token_scores >= 0.70
+        base_bounds = np.where(jaro_eligible, np.maximum(token_scores, jaro_bounds), token_scores)
+        upper_bounds = np.where(
+            business_pairs,
+            calculate_boosted_similarity_vec(base_bounds, matched_counts),
+            base_bounds + np.where(personal_pairs, _MAX_PERSONAL_BOOST, 0.0),
+        ).ravel()
+
+        # Pairs whose upper bound is below the best lower bound can never win, so only the
+        # survivors are sorted and visited, from the highest bound down, stopping as soon
+        # as no remaining pair can reach the best score
+        survivors = np.flatnonzero(upper_bounds >= score_floor)
+        candidates = survivors[np.argsort(-upper_bounds[survivors], kind="stable")]
+        customer_count = token_scores.shape[1]
+
+        # Flat index (query-major) of the best match, used to break score ties in favour
+        # of the earliest input name and customer, as a sequential scan would
+        best_position = None
+
+        for position in candidates.tolist():
+            if upper_bounds[position] < best_score:
+                break
+
+            query_index, customer_index = divmod(position, customer_count)
+            potential_name, potential_name_normalized, potential_is_personal, potential_keywords, _ = queries[query_index]
+
+            customer_id = customer_cache.customer_ids[customer_index]
+            db_name_normalized = customer_cache.normalized[customer_index]
+            db_keywords = customer_cache.keywords[customer_index]
+            db_customer_name = customer_cache.originals[customer_index]
+            db_is_personal = customer_cache.is_personal[customer_index]
+
+            # Calculate base similarity using dual scoring strategy:
+            # 1. token_set_ratio: excels at word order variations and multi-word matches
+            # 2. Jaro-Winkler: excels at character-level typos and abbreviations
+            #
+            # Conservative approach: Only use Jaro-Winkler as a boost when token score
+            # is already reasonably close (>=70%), to avoid false positives from
+            # unrelated names that happen to share character patterns.
+            token_score = float(token_scores[query_index, customer_index])
+
+            # Only calculate Jaro-Winkler if token score shows some similarity
+            # (and its length bound says it could raise the base score)
+            if jaro_eligible[query_index, customer_index] and jaro_bounds[query_index, customer_index] > token_score:
+                jaro_score = calculate_jaro_winkler_similarity(
                     potential_name_normalized,
-                    db_name_normalized
-                ) / 100.0
-
-                # Only calculate Jaro-Winkler if token score shows some similarity
-                if token_score >= 0.70:
-                    jaro_score = calculate_jaro_winkler_similarity(
-                        potential_name_normalized,
-                        db_name_normalized,
-                        prefix_weight=0.15
-                    )
-                    # Use maximum - catches abbreviations like FAMICAS → FAMICAST
-                    base_score = max(token_score, jaro_score)
-                else:
-                    # Token score too low - likely unrelated names, don't boost
-                    base_score = token_score
-
-                # Apply appropriate boosting strategy
-                if potential_is_personal and db_is_personal:
-                    # Both are personal names: apply weighted token scoring
-                    final_score = calculate_weighted_token_similarity(
-                        potential_name_normalized,
-                        db_name_normalized,
-                        base_score
-                    )
-                    boost = final_score - base_score
-                elif not potential_is_personal and not db_is_personal:
-                    # Both are business names: apply buying group boost
-                    final_score = calculate_boosted_similarity(
-                        potential_name_normalized,
-                        db_name_normalized,
-                        potential_keywords,
-                        db_keywords,
-                        base_score
-                    )
-                    boost = final_score - base_score
-                else:
-                    # Mismatched types (personal vs business): no boost
-                    final_score = base_score
-                    boost = 0.0
-
-                # Track best match
-                if final_score > best_score:
-                    best_score = final_score
-                    best_match = potential_name
-                    best_customer_id = customer_id
-                    best_customer_name = db_customer_name
-                    best_base_score = base_score
-                    best_boost = boost
-                    # Calculate matched keywords (only for business names)
-                    if potential_keywords and db_keywords:
-                        best_keywords_matched = list(set(potential_keywords) & set(db_keywords))
-                    else:
-                        best_keywords_matched = []
+                    db_name_normalized,
+                    prefix_weight=0.15
+                )
+                # Use maximum - catches abbreviations like FAMICAS → FAMICAST
+                base_score = max(token_score, jaro_score)
+            else:
+                # Token score too low - likely unrelated names, don't boost
+                base_score = token_score
+
+            # Apply appropriate boosting strategy
+            if potential_is_personal and db_is_personal:
+                # Both are personal names: apply weighted token scoring
+                final_score = calculate_weighted_token_similarity(
+                    potential_name_normalized,
+                    db_name_normalized,
+                    base_score
+                )
+                boost = final_score - base_score
+            elif not potential_is_personal and not db_is_personal:
+                # Both are business names: apply buying group boost
+                final_score = calculate_boosted_similarity(
+                    potential_name_normalized,
+                    db_name_normalized,
+                    potential_keywords,
+                    db_keywords,
+                    base_score
+                )
+                boost = final_score - base_score
+            else:
+                # Mismatched types (personal vs business): no boost
+                final_score = base_score
+                boost = 0.0
+
+            # Track best match
+            if final_score > best_score or (
+                final_score == best_score and best_position is not None and position < best_position
+            ):
+                best_score = final_score
+                best_position = position
+                best_match = potential_name
+                best_customer_id = customer_id
+                best_customer_name = db_customer_name
+                best_base_score = base_score
+                best_boost = boost
+
+        # Calculate matched keywords once for the winner (only for business names)
+        if best_position is not None:
+            query_index, customer_index = divmod(best_position, customer_count)
+            best_query_keywords_fs = queries[query_index][4]
+            best_db_keywords_fs = customer_cache.keywords_fs[customer_index]
+            if best_query_keywords_fs and best_db_keywords_fs:
+                best_keywords_matched = list(best_query_keywords_fs & best_db_keywords_fs)
 
         # Update match details with best match info
         match_details = {
@@ -347,47 +838,21 @@ class DatabaseHelper:
             "keywords_matched": best_keywords_matched
         }
 
-        # Return best match if above threshold
-        if best_score >= threshold:
-            # Enhanced logging with normalization details
-            if best_boost > 0:
-                logger.info(
-                    f"Fuzzy match found: '{best_match}' -> '{best_customer_name}' "
-                    f"(ID: {best_customer_id}, base_score: {best_base_score:.2f}, "
-                    f"boost: +{best_boost:.2f}, final_score: {best_score:.2f}, "
-                    f"keywords_matched: {best_keywords_matched})"
-                )
-            else:
-                logger.info(
-                    f"Fuzzy match found: '{best_match}' -> '{best_customer_name}' "
-                    f"(ID: {best_customer_id}, score: {best_score:.2f})"
-                )
-            return best_customer_id, best_customer_name, match_details
-        else:
-            # Enhanced logging for failures
-            if best_boost > 0:
-                logger.warning(
-                    f"No fuzzy match found for: {potential_names} "
-                    f"(base_score: {best_base_score:.2f}, boost: +{best_boost:.2f}, "
-                    f"final_score: {best_score:.2f}, threshold: {threshold}, "
-                    f"closest match: '{best_customer_name}' ID: {best_customer_id}, "
-                    f"keywords_matched: {best_keywords_matched})"
-                )
-            else:
-                logger.warning(
-                    f"No fuzzy match found for: {potential_names} "
-                    f"(best score: {best_score:.2f}, threshold: {threshold}, "
-                    f"closest match: '{best_customer_name}' ID: {best_customer_id})"
-                )
-            return None, None, match_details
+        return match_details
 
     def get_product_families(self) -> List[Tuple[str, str]]:
         """
         Get product families from public.family table
 
+        Cached on this helper after the first call; use invalidate_reference_caches()
+        to pick up table changes.
+
         Returns:
             List of (family_desc, 13DigitPrefix) tuples where brochure_sku = 'Y'
         """
+        if self._product_families_cache is not None:
+            return list(self._product_families_cache)
+
         query = """
             SELECT family_desc, "13DigitPrefix"
             FROM public.family
@@ -396,19 +861,26 @@ class DatabaseHelper:
         """
         try:
             results = self.execute_query(query)
-            logger.info(f"Retrieved {len(results)} product families from database")
-            return results
+            logger.info("Retrieved %s product families from database", len(results))
+            self._product_families_cache = results
+            return list(results)
         except Exception as e:
-            logger.error(f"Failed to retrieve product families: {e}")
+            logger.error("Failed to retrieve product families: %s", e)
             raise
 
     def get_color_codes(self) -> List[Tuple[str, str]]:
         """
         Get color codes from public.colorcode table
 
+        Cached on this helper after the first call; use invalidate_reference_caches()
+        to pick up table changes.
+
         Returns:
             List of (color_description, colorcode) tuples
         """
+        if self._color_codes_cache is not None:
+            return list(self._color_codes_cache)
+
         query = """
             SELECT color_description, colorcode
             FROM public.colorcode
@@ -416,10 +888,11 @@ class DatabaseHelper:
         """
         try:
             results = self.execute_query(query)
-            logger.info(f"Retrieved {len(results)} color codes from database")
-            return results
+            logger.info("Retrieved %s color codes from database", len(results))
+            self._color_codes_cache = results
+            return list(results)
         except Exception as e:
-            logger.error(f"Failed to retrieve color codes: {e}")
+            logger.error("Failed to retrieve color codes: %s", e)
             raise
 
     def get_customer_addresses(self, customerid: int) -> List[Dict[str, str]]:
@@ -448,16 +921,17 @@ class DatabaseHelper:
             addresses = [
                 {
                     "street_address": row[0],
-                    "post_code": row[1],
-                    "city": row[2],
-                    "province": row[3]
+                    # Post codes, cities and provinces repeat heavily across addresses
+                    "post_code": _intern(row[1]),
+                    "city": _intern(row[2]),
+                    "province": _intern(row[3])
                 }
                 for row in results
             ]
-            logger.info(f"Retrieved {len(addresses)} addresses for customer {customerid}")
+            logger.info("Retrieved %s addresses for customer %s", len(addresses), customerid)
             return addresses
         except Exception as e:
-            logger.error(f"Failed to retrieve addresses for customer {customerid}: {e}")
+            logger.error("Failed to retrieve addresses for customer %s: %s", customerid, e)
             return []
 
     def get_clavei_input_data(self) -> Tuple[List[str], List[tuple]]:
@@ -481,10 +955,10 @@ class DatabaseHelper:
                 # Get column names from cursor description
                 column_names = [desc[0] for desc in cursor.description]
                 results = cursor.fetchall()
-                logger.info(f"Retrieved {len(results)} rows from AI_Tool_OutputTable_v2")
+                logger.info("Retrieved %s rows from AI_Tool_OutputTable_v2", len(results))
                 return column_names, results
         except Exception as e:
-            logger.error(f"Failed to retrieve Clavei input data: {e}")
+            logger.error("Failed to retrieve Clavei input data: %s", e)
             raise
 
     def query_options_table(
@@ -521,7 +995,7 @@ class DatabaseHelper:
             # Premium family requires size and type
             if family_lower == "premium":
                 if not size or not option_type:
-                    logger.warning(f"Premium family requires size and type (size={size}, type={option_type})")
+                    logger.warning("Premium family requires size and type (size=%s, type=%s)", size, option_type)
                     return None
 
                 # Try with color match first
@@ -537,7 +1011,7 @@ class DatabaseHelper:
                     results = self.execute_query(query, (family, color_code, size, option_type))
                     if results:
                         option_sku = results[0][0]
-                        logger.info(f"Options match (Premium): family={family}, color={color_code}, size={size}, type={option_type} -> {option_sku}")
+                        logger.info("Options match (Premium): family=%s, color=%s, size=%s, type=%s -> %s", family, color_code, size, option_type, option_sku)
                         return option_sku
 
                 # Fallback to default_size = true
@@ -552,16 +1026,16 @@ class DatabaseHelper:
                 results = self.execute_query(query, (family, size, option_type))
                 if results:
                     option_sku = results[0][0]
-                    logger.info(f"Options match (Premium default): family={family}, size={size}, type={option_type} -> {option_sku}")
+                    logger.info("Options match (Premium default): family=%s, size=%s, type=%s -> %s", family, size, option_type, option_sku)
                     return option_sku
 
-                logger.warning(f"No option SKU found for Premium: family={family}, size={size}, type={option_type}")
+                logger.warning("No option SKU found for Premium: family=%s, size=%s, type=%s", family, size, option_type)
                 return None
 
             # Neo family - no fallback to default_size
             elif family_lower == "neo":
                 if not color_code:
-                    logger.warning(f"Neo family requires color code")
+                    logger.warning("Neo family requires color code")
                     return None
 
                 query = """
@@ -573,10 +1047,10 @@ class DatabaseHelper:
                 results = self.execute_query(query, (family, color_code))
                 if results:
                     option_sku = results[0][0]
-                    logger.info(f"Options match (Neo): family={family}, color={color_code} -> {option_sku}")
+                    logger.info("Options match (Neo): family=%s, color=%s -> %s", family, color_code, option_sku)
                     return option_sku
 
-                logger.warning(f"No option SKU found for Neo: family={family}, color={color_code}")
+                logger.warning("No option SKU found for Neo: family=%s, color=%s", family, color_code)
                 return None
 
             # All other families: Hermes, Nature, Marco Standard, Marco Personalised, Nature Semicircular
@@ -592,7 +1066,7 @@ class DatabaseHelper:
                     results = self.execute_query(query, (family, color_code))
                     if results:
                         option_sku = results[0][0]
-                        logger.info(f"Options match: family={family}, color={color_code} -> {option_sku}")
+                        logger.info("Options match: family=%s, color=%s -> %s", family, color_code, option_sku)
                         return option_sku
 
                 # Fallback to default_size = true
@@ -605,14 +1079,14 @@ class DatabaseHelper:
                 results = self.execute_query(query, (family,))
                 if results:
                     option_sku = results[0][0]
-                    logger.info(f"Options match (default): family={family} -> {option_sku}")
+                    logger.info("Options match (default): family=%s -> %s", family, option_sku)
                     return option_sku
 
-                logger.warning(f"No option SKU found for family: {family}")
+                logger.warning("No option SKU found for family: %s", family)
                 return None
 
         except Exception as e:
-            logger.error(f"Failed to query options table: {e}", exc_info=True)
+            logger.error("Failed to query options table: %s", e, exc_info=True)
             return None
 
     def insert_order(self, order_data: Dict[str, Any]) -> bool:
@@ -666,22 +1140,39 @@ class DatabaseHelper:
 
         try:
             self.execute_insert(query, params)
-            logger.debug(f"Inserted order {order_data.get('orderno')} for customer {order_data.get('customerid')}")
+            logger.debug("Inserted order %s for customer %s", order_data.get('orderno'), order_data.get('customerid'))
             return True
         except Exception as e:
-            logger.error(f"Failed to insert order: {e}")
+            logger.error("Failed to insert order: %s", e)
             return False
 
-    def insert_orders_batch(self, orders_data: List[Dict[str, Any]]) -> bool:
+    _JOB_RUNS_COUNTS_QUERY = """
+        UPDATE public.job_runs jr
+        SET
+            number_of_orders = c.n_orders,
+            number_of_order_lines = c.n_lines
+        FROM (
+            -- Both counts in one pass over the output rows of this job
+            SELECT COUNT(DISTINCT orderno) AS n_orders, COUNT(*) AS n_lines
+            FROM public.ai_tool_output_table
+            WHERE job_id = %s
+        ) c
+        WHERE jr.id = %s
+    """
+
+    def insert_orders_batch(self, orders_data: List[Dict[str, Any]], job_id: Optional[int] = None) -> bool:
         """
-        Insert multiple orders in a single multi-row INSERT statement
-        This ensures INSERT triggers see all rows together in one statement
+        Insert multiple orders with a single COPY statement
+        COPY fires INSERT triggers as one statement, so triggers see all rows together,
+        and rows are streamed without building a SQL string or parameter list per row
 
         Args:
             orders_data: List of order dictionaries with keys:
                 - orderno, customerid, 13DigitAlias, orderqty, reference_no, valve,
                   delivery_address, alternative_cpsd, entry_id, option_sku, option_qty,
                   telephone_number, contact_name, order_type (always "text order")
+            job_id: If given, job_runs counts for this job are refreshed in the same
+                transaction as the insert, once the triggers have written the output rows
 
         Returns:
             True if all successful, False otherwise
@@ -692,58 +1183,52 @@ class DatabaseHelper:
 
         self.connect()
 
+        query = """
+            COPY testing.ai_tool_input_table_from_web_app
+            (orderno, customerid, customer_name, "13DigitAlias", orderqty, reference_no, valve, delivery_address, alternative_cpsd, entry_id, option_sku, option_qty, telephone_number, contact_name, order_type, job_id)
+            FROM STDIN
+        """
+
         try:
             with self.connection.cursor() as cursor:
-                # Build multi-row INSERT statement
-                # INSERT INTO table (cols) VALUES (row1), (row2), (row3)...
-
-                # Create placeholders for each row: (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                value_placeholder = "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
-
-                # Create comma-separated list of placeholders for all rows
-                values_clause = ", ".join([value_placeholder] * len(orders_data))
-
-                # Build complete query
-                query = f"""
-                    INSERT INTO testing.ai_tool_input_table_from_web_app
-                    (orderno, customerid, customer_name, "13DigitAlias", orderqty, reference_no, valve, delivery_address, alternative_cpsd, entry_id, option_sku, option_qty, telephone_number, contact_name, order_type, job_id)
-                    VALUES {values_clause}
-                """
+                with cursor.copy(query) as copy:
+                    for order in orders_data:
+                        copy.write_row((
+                            order.get("orderno"),
+                            order.get("customerid"),
+                            order.get("customer_name"),
+                            order.get("13DigitAlias"),
+                            order.get("orderqty"),
+                            order.get("reference_no"),
+                            order.get("valve"),
+                            order.get("delivery_address"),
+                            order.get("alternative_cpsd"),
+                            order.get("entry_id"),
+                            order.get("option_sku"),
+                            order.get("option_qty"),
+                            order.get("telephone_number"),
+                            order.get("contact_name"),
+                            "text order",
+                            order.get("job_id"),
+                        ))
+
+                if job_id:
+                    # Savepoint: a failed count refresh must not undo the insert
+                    try:
+                        with self.connection.transaction():
+                            cursor.execute(self._JOB_RUNS_COUNTS_QUERY, (job_id, job_id), prepare=self._prepare_flag(True))
+                    except Exception as e:
+                        logger.error("Failed to update job_runs counts for job_id %s: %s", job_id, e)
 
-                # Flatten all parameters into single tuple
-                # Each order contributes 16 values, so final tuple has 16 * len(orders_data) values
-                all_params = []
-                for order in orders_data:
-                    all_params.extend([
-                        order.get("orderno"),
-                        order.get("customerid"),
-                        order.get("customer_name"),
-                        order.get("13DigitAlias"),
-                        order.get("orderqty"),
-                        order.get("reference_no"),
-                        order.get("valve"),
-                        order.get("delivery_address"),
-                        order.get("alternative_cpsd"),
-                        order.get("entry_id"),
-                        order.get("option_sku"),
-                        order.get("option_qty"),
-                        order.get("telephone_number"),
-                        order.get("contact_name"),
-                        "text order",
-                        order.get("job_id"),
-                    ])
-
-                # Execute single multi-row INSERT
-                cursor.execute(query, tuple(all_params))
                 self.connection.commit()
 
-                logger.info(f"Successfully inserted {len(orders_data)} orders in single INSERT statement")
+                logger.info("Successfully inserted %s orders in single COPY statement", len(orders_data))
                 return True
 
         except Exception as e:
             self.connection.rollback()
-            logger.error(f"Batch insert failed: {e}")
-            logger.debug(f"Failed to insert {len(orders_data)} orders")
+            logger.error("Batch insert failed: %s", e)
+            logger.debug("Failed to insert %s orders", len(orders_data))
             return False
 
     def update_job_runs_counts(self, job_id: int) -> bool:
@@ -756,30 +1241,14 @@ class DatabaseHelper:
         Returns:
             True if successful, False otherwise
         """
-        query = """
-            UPDATE public.job_runs
-            SET
-                number_of_orders = (
-                    SELECT COUNT(DISTINCT orderno)
-                    FROM public.ai_tool_output_table
-                    WHERE job_id = %s
-                ),
-                number_of_order_lines = (
-                    SELECT COUNT(*)
-                    FROM public.ai_tool_output_table
-                    WHERE job_id = %s
-                )
-            WHERE id = %s
-        """
-
-        params = (job_id, job_id, job_id)
+        params = (job_id, job_id)
 
         try:
-            self.execute_insert(query, params)
-            logger.info(f"Updated job_runs counts for job_id {job_id}")
+            self.execute_insert(self._JOB_RUNS_COUNTS_QUERY, params, prepare=True)
+            logger.info("Updated job_runs counts for job_id %s", job_id)
             return True
         except Exception as e:
-            logger.error(f"Failed to update job_runs counts for job_id {job_id}: {e}")
+            logger.error("Failed to update job_runs counts for job_id %s: %s", job_id, e)
             return False
 
     def save_failure_context(self, job_id: int, contexts: List[Dict[str, Any]]) -> bool:
@@ -800,11 +1269,12 @@ class DatabaseHelper:
         """
 
         try:
-            self.execute_insert(query, (json.dumps(contexts), job_id))
-            logger.info(f"Saved {len(contexts)} failure context(s) for job_id {job_id}")
+            # Sent through psycopg's jsonb adapter rather than as a text parameter
+            self.execute_insert(query, (Jsonb(contexts, dumps=_dump_jsonb), job_id), prepare=True)
+            logger.info("Saved %s failure context(s) for job_id %s", len(contexts), job_id)
             return True
         except Exception as e:
-            logger.error(f"Failed to save failure context for job_id {job_id}: {e}")
+            logger.error("Failed to save failure context for job_id %s: %s", job_id, e)
             return False
 
     def get_failure_context(self, job_id: int) -> Optional[List[Dict[str, Any]]]:
@@ -824,15 +1294,15 @@ class DatabaseHelper:
         """
 
         try:
-            results = self.execute_query(query, (job_id,))
+            results = self.execute_query(query, (job_id,), prepare=True)
             if results and results[0][0]:
                 return results[0][0]  # JSONB is automatically deserialized by psycopg
             return None
         except Exception as e:
-            logger.error(f"Failed to get failure context for job_id {job_id}: {e}")
+            logger.error("Failed to get failure context for job_id %s: %s", job_id, e)
             return None
 
-    def save_failure_summary(self, job_id: int, summary: str) -> bool:
+    def save_failure_summary(self, job_id: int, summary: str) -> Optional[Dict[str, Any]]:
         """
         Save generated failure summary to job_runs table
 
@@ -841,22 +1311,29 @@ class DatabaseHelper:
             summary: AI-generated summary text
 
         Returns:
-            True if successful, False otherwise
+            Stored row as a dictionary with 'failure_summary' and 'failure_summary_generated_at'
+            (same shape as get_failure_summary), or None if the save failed or the job doesn't exist
         """
         query = """
             UPDATE public.job_runs
             SET failure_summary = %s,
                 failure_summary_generated_at = CURRENT_TIMESTAMP
             WHERE id = %s
+            RETURNING failure_summary, failure_summary_generated_at
         """
 
         try:
-            self.execute_insert(query, (summary, job_id))
-            logger.info(f"Saved failure summary for job_id {job_id}")
-            return True
+            row = self.execute_insert(query, (summary, job_id), prepare=True)
+            logger.info("Saved failure summary for job_id %s", job_id)
+            if row is None:
+                return None
+            return {
+                "failure_summary": row[0],
+                "failure_summary_generated_at": row[1]
+            }
         except Exception as e:
-            logger.error(f"Failed to save failure summary for job_id {job_id}: {e}")
-            return False
+            logger.error("Failed to save failure summary for job_id %s: %s", job_id, e)
+            return None
 
     def get_failure_summary(self, job_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -875,7 +1352,7 @@ class DatabaseHelper:
         """
 
         try:
-            results = self.execute_query(query, (job_id,))
+            results = self.execute_query(query, (job_id,), prepare=True)
             if results and results[0][0]:
                 return {
                     "failure_summary": results[0][0],
@@ -883,13 +1360,14 @@ class DatabaseHelper:
                 }
             return None
         except Exception as e:
-            logger.error(f"Failed to get failure summary for job_id {job_id}: {e}")
+            logger.error("Failed to get failure summary for job_id %s: %s", job_id, e)
             return None
 
     def lookup_customer_by_email(self, email_address: str) -> Optional[Tuple[int, str]]:
         """
         Look up customer by email address in email_lookup_for_customer table.
         Used as a fallback when customer name extraction and fuzzy matching fail.
+        Results (including misses) are cached per process for EMAIL_LOOKUP_CACHE_TTL seconds.
 
         Args:
             email_address: Email address to look up (case-insensitive)
@@ -900,24 +1378,71 @@ class DatabaseHelper:
         if not email_address:
             return None
 
+        result = self.lookup_customers_by_emails([email_address]).get(email_address.lower())
+        if result:
+            customerid, customername = result
+            logger.info("Email lookup found: %s -> ID=%s, Name=%s", email_address, customerid, customername)
+        else:
+            logger.info("Email lookup: no match for %s", email_address)
+        return result
+
+    def lookup_customers_by_emails(self, email_addresses: List[str]) -> Dict[str, Tuple[int, str]]:
+        """
+        Look up many email addresses in email_lookup_for_customer with one query.
+
+        Addresses already in the lookup cache are served from it; the rest are
+        fetched together and cached (misses included). Calling this up front for
+        a whole job warms the cache for later lookup_customer_by_email() calls.
+
+        Args:
+            email_addresses: Email addresses to look up (case-insensitive)
+
+        Returns:
+            Dictionary mapping lowercased email address to (customerid, customername)
+            for the addresses that were found
+        """
+        found = {}
+        missing = []
+        now = time.monotonic()
+        with self._CACHE_LOCK:
+            for cache_key in dict.fromkeys(email.lower() for email in email_addresses if email):
+                cached = self._EMAIL_LOOKUP_CACHE.get(cache_key)
+                if cached is not None and cached[0] > now:
+                    self._EMAIL_LOOKUP_CACHE.move_to_end(cache_key)
+                    if cached[1] is not None:
+                        found[cache_key] = cached[1]
+                else:
+                    missing.append(cache_key)
+
+        if not missing:
+            return found
+
         query = """
-            SELECT customerid, customername
+            SELECT LOWER(emailaddress), customerid, customername
             FROM public.email_lookup_for_customer
-            WHERE LOWER(emailaddress) = LOWER(%s)
-            LIMIT 1
+            WHERE LOWER(emailaddress) = ANY(%s)
         """
 
         try:
-            results = self.execute_query(query, (email_address,))
-            if results:
-                customerid, customername = results[0]
-                logger.info(f"Email lookup found: {email_address} -> ID={customerid}, Name={customername}")
-                return (customerid, customername)
-            logger.info(f"Email lookup: no match for {email_address}")
-            return None
+            results = self.execute_query(query, (missing,), prepare=True)
         except Exception as e:
-            logger.error(f"Email lookup failed for {email_address}: {e}")
-            return None
+            # Failures are not cached so the next call retries the database
+            logger.error("Email lookup failed for %s: %s", missing, e)
+            return found
+
+        fetched = {}
+        for email, customerid, customername in results:
+            fetched.setdefault(email, (customerid, customername))
+        found.update(fetched)
+
+        with self._CACHE_LOCK:
+            expires_at = now + self._EMAIL_LOOKUP_CACHE_TTL
+            for cache_key in missing:
+                self._EMAIL_LOOKUP_CACHE[cache_key] = (expires_at, fetched.get(cache_key))
+                self._EMAIL_LOOKUP_CACHE.move_to_end(cache_key)
+            while len(self._EMAIL_LOOKUP_CACHE) > self._EMAIL_LOOKUP_CACHE_SIZE:
+                self._EMAIL_LOOKUP_CACHE.popitem(last=False)
+        return found
 
 
 # Global instance (lazy initialization)
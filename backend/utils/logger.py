@@ -1,16 +1,58 @@
 """
 Logging configuration for Order Intake Automation
 """
+import atexit
 import logging
+import os
+import queue
 import sys
+import time
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from pathlib import Path
 from datetime import datetime
+from typing import List
+
+
+class DailyLogFileHandler(TimedRotatingFileHandler):
+    """
+    Write to logs/order_intake_YYYY-MM-DD.log, switching to a new file at midnight
+
+    Unlike the stock rollover this never renames files, so several worker
+    processes can safely append to the same day's log.
+    """
+
+    def __init__(self, log_dir: Path):
+        self.log_dir = log_dir
+        super().__init__(self._current_log_file(), when='midnight', encoding='utf-8', delay=True)
+
+    def _current_log_file(self) -> str:
+        # Log file name: order_intake_2025-10-01.log
+        return str(self.log_dir / f"order_intake_{datetime.now().strftime('%Y-%m-%d')}.log")
+
+    def doRollover(self):
+        """Close the current day's file and point at the new one (opened on next write)"""
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self.baseFilename = os.path.abspath(self._current_log_file())
+        self.rolloverAt = self.computeRollover(int(time.time()))
+
+
+def _start_listener(queue_handler: QueueHandler, handlers: List[logging.Handler]) -> QueueListener:
+    """Start a background thread that drains queue_handler's queue into handlers"""
+    listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
 
 
 def setup_logger(name: str = "order_intake", log_to_file: bool = True) -> logging.Logger:
     """
     Configure and return a logger instance
 
+    Records are put on a queue and written to the console/file handlers by a
+    background thread, so logging calls never block on I/O.
+
     Args:
         name: Logger name
         log_to_file: Whether to write logs to file (default: True)
@@ -36,7 +78,7 @@ def setup_logger(name: str = "order_intake", log_to_file: bool = True) -> loggin
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
 
     # File handler (optional)
     if log_to_file:
@@ -44,17 +86,25 @@ def setup_logger(name: str = "order_intake", log_to_file: bool = True) -> loggin
         log_dir = Path(__file__).parent.parent / "logs"
         log_dir.mkdir(exist_ok=True)
 
-        # Log file name: order_intake_2025-10-01.log
-        log_file = log_dir / f"order_intake_{datetime.now().strftime('%Y-%m-%d')}.log"
-
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler = DailyLogFileHandler(log_dir)
         file_handler.setLevel(logging.DEBUG)  # More detail in file
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    queue_handler = QueueHandler(queue.SimpleQueue())
+    logger.addHandler(queue_handler)
+    _start_listener(queue_handler, handlers)
+
+    # The listener thread doesn't survive fork (e.g. Celery prefork workers),
+    # so each child process starts its own on a fresh queue
+    def _restart_listener_in_child():
+        queue_handler.queue = queue.SimpleQueue()
+        _start_listener(queue_handler, handlers)
+
+    os.register_at_fork(after_in_child=_restart_listener_in_child)
 
     return logger
 
 
 # Create default logger instance
 logger = setup_logger()
-
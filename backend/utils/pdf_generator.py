@@ -5,12 +5,71 @@ Generates PDF documents from markdown content for failure summary reports.
 Uses fpdf2 library for pure Python PDF generation with no system dependencies.
 """
 
+import copy
 import re
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Union
+from typing import Dict, Optional, Union
+from fontTools import ttLib
 from fpdf import FPDF
 
+# Unicode fonts bundled in backend/fonts/
+FONTS_DIR = Path(__file__).parent.parent / 'fonts'
+
+# Numbered list item (1. item)
+_NUMBERED_ITEM_RE = re.compile(r'^(\d+)\.\s+(.+)$')
+
+# Anything that could start a header, bullet or numbered item; text without a match
+# is plain prose and every line renders as a paragraph
+_BLOCK_SYNTAX_RE = re.compile(r'#|[-*] |^\s*\d+\.\s', re.MULTILINE)
+
+# Inline formatting spans: bold **text** and code `text`
+_INLINE_FORMAT_RE = re.compile(r'(\*\*[^*]+\*\*|`[^`]+`)')
+
+# Parsed DejaVu fonts, built once per process (see _get_font_templates)
+_FONT_TEMPLATES: Optional[Dict[str, object]] = None
+_FONT_TEMPLATES_LOCK = threading.Lock()
+
+
+def _get_font_templates() -> Dict[str, object]:
+    """
+    Get the parsed DejaVu fonts, keyed like FPDF.fonts.
+
+    fpdf2 parses the whole TTF on every add_font() call, which is most of the cost
+    of a small PDF. The fonts are parsed once into a throwaway FPDF and each
+    document gets a copy from _copy_font_templates().
+    """
+    global _FONT_TEMPLATES
+    if _FONT_TEMPLATES is None:
+        with _FONT_TEMPLATES_LOCK:
+            if _FONT_TEMPLATES is None:
+                template_pdf = FPDF()
+                template_pdf.add_font('DejaVu', '', str(FONTS_DIR / 'DejaVuSans.ttf'))
+                template_pdf.add_font('DejaVu', 'B', str(FONTS_DIR / 'DejaVuSans-Bold.ttf'))
+                _FONT_TEMPLATES = dict(template_pdf.fonts)
+    return _FONT_TEMPLATES
+
+
+def _copy_font_templates() -> Dict[str, object]:
+    """
+    Copy the parsed DejaVu fonts for one document.
+
+    A deep copy keeps glyph subsets per document but shares the fontTools TTFont,
+    which output() subsets in place, so each copy reopens its own (lazily loaded)
+    TTFont the same way add_font() does. These are fpdf2 internals, which is why
+    requirements.txt pins fpdf2 to the release this was tested against.
+    """
+    fonts = copy.deepcopy(_get_font_templates())
+    for font in fonts.values():
+        font.ttfont = ttLib.TTFont(
+            font.ttffile,
+            recalcTimestamp=False,
+            fontNumber=font.collection_font_number,
+            lazy=True,
+        )
+    return fonts
+
 
 class FailureSummaryPdfGenerator(FPDF):
     """PDF generator specifically for failure summary reports."""
@@ -43,9 +102,8 @@ class FailureSummaryPdfGenerator(FPDF):
         self.set_auto_page_break(auto=True, margin=20)
 
         # Add Unicode font support - DejaVu fonts bundled in backend/fonts/
-        fonts_dir = Path(__file__).parent.parent / 'fonts'
-        self.add_font('DejaVu', '', str(fonts_dir / 'DejaVuSans.ttf'))
-        self.add_font('DejaVu', 'B', str(fonts_dir / 'DejaVuSans-Bold.ttf'))
+        # (equivalent to add_font() for each style, without re-parsing the TTF files)
+        self.fonts.update(_copy_font_templates())
 
         self.add_page()
 
@@ -81,49 +139,42 @@ class FailureSummaryPdfGenerator(FPDF):
         if not markdown_content:
             return
 
-        lines = markdown_content.split('\n')
-        i = 0
+        if not _BLOCK_SYNTAX_RE.search(markdown_content):
+            self._render_plain_text(markdown_content)
+            return
 
-        while i < len(lines):
-            line = lines[i]
+        for line in markdown_content.split('\n'):
+            stripped = line.strip()
 
             # Skip empty lines (add small spacing)
-            if not line.strip():
+            if not stripped:
                 self.ln(3)
-                i += 1
-                continue
-
             # H2 header (## Header)
-            if line.startswith('## '):
+            elif line.startswith('## '):
                 self._render_h2(line[3:].strip())
-                i += 1
-                continue
-
             # H3 header (### Header)
-            if line.startswith('### '):
+            elif line.startswith('### '):
                 self._render_h3(line[4:].strip())
-                i += 1
-                continue
-
             # Bullet list item (- item or * item)
-            if line.strip().startswith('- ') or line.strip().startswith('* '):
-                bullet_text = line.strip()[2:].strip()
-                self._render_bullet(bullet_text)
-                i += 1
-                continue
-
-            # Numbered list item (1. item)
-            numbered_match = re.match(r'^(\d+)\.\s+(.+)$', line.strip())
-            if numbered_match:
-                number = numbered_match.group(1)
-                text = numbered_match.group(2)
-                self._render_numbered_item(number, text)
-                i += 1
-                continue
-
-            # Regular paragraph
-            self._render_paragraph(line.strip())
-            i += 1
+            elif stripped[:2] in ('- ', '* '):
+                self._render_bullet(stripped[2:].strip())
+            else:
+                numbered_match = _NUMBERED_ITEM_RE.match(stripped)
+                if numbered_match:
+                    # Numbered list item (1. item)
+                    self._render_numbered_item(numbered_match.group(1), numbered_match.group(2))
+                else:
+                    # Regular paragraph
+                    self._render_paragraph(stripped)
+
+    def _render_plain_text(self, text: str):
+        """Render text with no block-level markdown as paragraphs."""
+        for line in text.split('\n'):
+            stripped = line.strip()
+            if stripped:
+                self._render_paragraph(stripped)
+            else:
+                self.ln(3)
 
     def _render_h2(self, text: str):
         """Render H2 header with border."""
@@ -185,15 +236,16 @@ class FailureSummaryPdfGenerator(FPDF):
         """Render text with bold and code span formatting."""
         self.set_x(indent)
 
-        # Parse inline formatting (bold **text** and code `text`)
-        pattern = r'(\*\*[^*]+\*\*|`[^`]+`)'
-        parts = re.split(pattern, text)
-
-        # Calculate available width
-        page_width = 210 - indent - 10  # A4 width minus margins
+        # Plain text (the common case): no spans to split out
+        if '**' not in text and '`' not in text:
+            if text:
+                self.set_font('DejaVu', '', 10)
+                self.write(5, text)
+            self.ln()
+            return
 
-        current_line = ""
-        current_x = indent
+        # Parse inline formatting (bold **text** and code `text`)
+        parts = _INLINE_FORMAT_RE.split(text)
 
         for part in parts:
             if not part:
@@ -211,7 +263,7 @@ class FailureSummaryPdfGenerator(FPDF):
                 clean_text = part
                 self.set_font('DejaVu', '', 10)
 
-            # Simple approach: just output text, let multi_cell handle wrapping
+            # write() continues the current line, wrapping at the right margin
             self.write(5, clean_text)
 
         self.ln()
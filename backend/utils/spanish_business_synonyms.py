@@ -6,10 +6,12 @@ and buying group keywords for improved fuzzy matching of customer names.
 """
 
 import re
+from types import MappingProxyType
 
 # Business type synonyms (normalize to canonical form)
 # Key: synonym to replace, Value: canonical form to normalize to
-BUSINESS_TYPE_SYNONYMS = {
+# (read-only view: these tables are shared module-wide and never modified)
+BUSINESS_TYPE_SYNONYMS = MappingProxyType({
     # Building supplies synonyms
     "almacenes": "materiales",
     "almacen": "materiales",
@@ -24,19 +26,41 @@ BUSINESS_TYPE_SYNONYMS = {
 
     # Commerce variations
     "comercial": "comercio",
-}
+})
+
+# All synonyms fused into one whole-word alternation (one named group per synonym,
+# in the order above) so a name is scanned once instead of once per synonym.
+# BUSINESS_TYPE_SYNONYM_REPLACEMENTS maps each group name to its canonical form.
+BUSINESS_TYPE_SYNONYMS_RE = re.compile(
+    r"\b(?:" + "|".join(
+        f"(?P<s{index}>{re.escape(synonym)})" for index, synonym in enumerate(BUSINESS_TYPE_SYNONYMS)
+    ) + r")\b",
+    re.IGNORECASE,
+)
+# Case-sensitive twin for text known to be lowercase ASCII: case-insensitive matching
+# only differs from it on non-ASCII text (e.g. "ſ" matches "s" under IGNORECASE)
+BUSINESS_TYPE_SYNONYMS_LOWER_RE = re.compile(BUSINESS_TYPE_SYNONYMS_RE.pattern)
+BUSINESS_TYPE_SYNONYM_REPLACEMENTS = MappingProxyType({
+    f"s{index}": canonical for index, canonical in enumerate(BUSINESS_TYPE_SYNONYMS.values())
+})
 
 # Legal entity suffix patterns (regex pattern, replacement)
 # These patterns normalize Spanish legal entity suffixes to standard forms
+# Longer suffixes come first, and each comma form before its plain form: LEGAL_ENTITY_RE
+# takes the first alternative matching at the leftmost position, which for ", S.L.U."
+# is the comma (", S.L" would otherwise leave the "U." behind)
 LEGAL_ENTITY_PATTERNS = [
-    # Sociedad Limitada variations (with and without trailing period)
+    # Sociedad Limitada Unipersonal variations (with and without trailing period)
+    (r'\b,\s*S\.L\.U\.?\b', ' SL'),  # , S.L.U. or , S.L.U -> SL
     (r'\bS\.L\.U\.?\b', 'SL'),  # S.L.U. or S.L.U -> SL
-    (r'\bS\.L\.?\b', 'SL'),     # S.L. or S.L -> SL (catches most cases)
+
+    # Sociedad Limitada variations (with and without trailing period)
     (r'\b,\s*S\.L\.?\b', ' SL'),  # , S.L. or , S.L -> SL
+    (r'\bS\.L\.?\b', 'SL'),     # S.L. or S.L -> SL (catches most cases)
 
     # Sociedad Anónima variations
-    (r'\bS\.A\.?\b', 'SA'),     # S.A. or S.A -> SA
     (r'\b,\s*S\.A\.?\b', ' SA'),  # , S.A. or , S.A -> SA
+    (r'\bS\.A\.?\b', 'SA'),     # S.A. or S.A -> SA
 
     # Sociedad Cooperativa
     (r'\bS\.C\.?\b', 'SC'),     # S.C. or S.C -> SC
@@ -51,6 +75,21 @@ COMPILED_LEGAL_ENTITY_PATTERNS = [
     for pattern, replacement in LEGAL_ENTITY_PATTERNS
 ]
 
+# All legal entity patterns fused into one alternation (one named group per pattern,
+# in the order above) so a name is scanned once instead of once per pattern.
+# LEGAL_ENTITY_REPLACEMENTS maps each group name to its replacement.
+LEGAL_ENTITY_RE = re.compile(
+    "|".join(f"(?P<p{index}>{pattern})" for index, (pattern, _) in enumerate(LEGAL_ENTITY_PATTERNS)),
+    re.IGNORECASE,
+)
+# Case-sensitive twin for lowercase ASCII text (the patterns only use lowercase escapes, \b and \s)
+LEGAL_ENTITY_LOWER_RE = re.compile(
+    "|".join(f"(?P<p{index}>{pattern.lower()})" for index, (pattern, _) in enumerate(LEGAL_ENTITY_PATTERNS)),
+)
+LEGAL_ENTITY_REPLACEMENTS = MappingProxyType({
+    f"p{index}": replacement for index, (_, replacement) in enumerate(LEGAL_ENTITY_PATTERNS)
+})
+
 # Buying group keywords (for score boosting)
 # These keywords indicate buying group membership and should boost match scores
 BUYING_GROUP_KEYWORDS = [
@@ -61,9 +100,15 @@ BUYING_GROUP_KEYWORDS = [
     "asociacion",
 ]
 
+# All buying group keywords as one whole-word alternation, so a name is scanned once.
+# Whole-word matches never overlap, so findall() sees every keyword present.
+BUYING_GROUP_KEYWORDS_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(keyword) for keyword in BUYING_GROUP_KEYWORDS) + r")\b"
+)
+
 # Spanish gendered name pairs (normalize masculine <-> feminine for fuzzy matching)
 # This allows fuzzy matching to recognize ANTONIO and ANTONIA as equivalent
-SPANISH_GENDERED_NAMES = {
+SPANISH_GENDERED_NAMES = MappingProxyType({
     # Masculine -> Feminine
     "antonio": "antonia",
     "francisco": "francisca",
@@ -107,10 +152,10 @@ SPANISH_GENDERED_NAMES = {
     "rafaela": "rafael",
     "sergia": "sergio",
     "diega": "diego",
-}
+})
 
 # Common Spanish given names (low weight in matching - very generic)
-COMMON_SPANISH_GIVEN_NAMES = {
+COMMON_SPANISH_GIVEN_NAMES = frozenset({
     "maria", "jose", "antonio", "francisco", "juan", "manuel", "david",
     "jesus", "javier", "daniel", "carlos", "miguel", "rafael", "pedro",
     "angel", "alejandro", "fernando", "pablo", "sergio", "jorge", "luis",
@@ -118,14 +163,14 @@ COMMON_SPANISH_GIVEN_NAMES = {
     "antonia", "ana", "carmen", "dolores", "isabel", "pilar", "josefa",
     "francisca", "rosa", "teresa", "mercedes", "cristina", "laura", "marta",
     "paula", "lucia", "andrea", "sara", "elena", "patricia", "raquel",
-}
+})
 
 # Common Spanish surnames (higher weight in matching - more specific)
-COMMON_SPANISH_SURNAMES = {
+COMMON_SPANISH_SURNAMES = frozenset({
     "garcia", "rodriguez", "martinez", "lopez", "gonzalez", "hernandez",
     "perez", "sanchez", "ramirez", "torres", "flores", "rivera", "gomez",
     "diaz", "cruz", "morales", "reyes", "gutierrez", "ortiz", "chavez",
     "ruiz", "alvarez", "castillo", "jimenez", "moreno", "romero", "vargas",
     "fernandez", "suarez", "ramos", "vazquez", "mendez", "castro", "rojas",
     "barroso", "sevilla", "navarro", "medina", "aguilar", "cortes", "silva",
-}
+})
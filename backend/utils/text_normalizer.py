@@ -6,16 +6,96 @@ fuzzy matching accuracy by handling synonyms, legal entity variations,
 and buying group affiliations.
 """
 
+import logging
 import re
 import unicodedata
-from typing import List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import FrozenSet, List, NamedTuple, Tuple
+import numpy as np
+from rapidfuzz.distance import JaroWinkler
 from .spanish_business_synonyms import (
     BUSINESS_TYPE_SYNONYMS,
-    COMPILED_LEGAL_ENTITY_PATTERNS,
-    BUYING_GROUP_KEYWORDS
+    BUSINESS_TYPE_SYNONYMS_RE,
+    BUSINESS_TYPE_SYNONYMS_LOWER_RE,
+    BUSINESS_TYPE_SYNONYM_REPLACEMENTS,
+    LEGAL_ENTITY_RE,
+    LEGAL_ENTITY_LOWER_RE,
+    LEGAL_ENTITY_REPLACEMENTS,
+    BUYING_GROUP_KEYWORDS,
+    BUYING_GROUP_KEYWORDS_RE,
+    COMMON_SPANISH_GIVEN_NAMES,
+    COMMON_SPANISH_SURNAMES,
+    SPANISH_GENDERED_NAMES
 )
 
 
+logger = logging.getLogger(__name__)
+
+# The normalizers are pure and see the same names over and over (the same
+# customers recur across emails), so results are memoized per process
+_NORMALIZE_CACHE_SIZE = 65536
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _strip_combining_marks(text: str) -> str:
+    """Decompose to NFD and drop combining diacritical marks (category Mn)"""
+    nfd = unicodedata.normalize('NFD', text)
+    return ''.join(char for char in nfd if unicodedata.category(char) != 'Mn')
+
+
+# Accented Latin letters (Latin-1 Supplement and Latin Extended-A, which covers
+# Spanish and most Western European names) mapped to exactly what
+# _strip_combining_marks gives for them, so remove_accents can use str.translate
+_ACCENT_TABLE = {
+    codepoint: _strip_combining_marks(chr(codepoint))
+    for codepoint in range(0xC0, 0x180)
+    if _strip_combining_marks(chr(codepoint)) != chr(codepoint)
+}
+
+# _ACCENT_TABLE with lowercasing folded in: ASCII capitals and the same Latin range
+# mapped straight to their lowercase unaccented ASCII form (see lower_and_remove_accents)
+_LOWER_ACCENT_TABLE = {
+    codepoint: ascii_form
+    for codepoint, ascii_form in (
+        (codepoint, _strip_combining_marks(chr(codepoint).lower()))
+        for codepoint in [*range(ord('A'), ord('Z') + 1), *range(0xC0, 0x180)]
+    )
+    if ascii_form != chr(codepoint) and ascii_form.isascii()
+}
+
+# Legal entity suffixes that mark a business name (see is_personal_name)
+_LEGAL_ENTITY_SUFFIX_RE = re.compile(
+    r'\b(?:sl|sa|sc|s\.l|s\.a|s\.c|s\.l\.u|s\.l\.l|slu|sll)\b',
+    re.IGNORECASE,
+)
+
+# Each gendered name mapped to the alphabetically first of its pair
+# (e.g. "antonio" and "antonia" both -> "antonia"), see normalize_personal_name
+_GENDERED_NAME_CANONICAL = MappingProxyType({
+    name: min(name, variant) for name, variant in SPANISH_GENDERED_NAMES.items()
+})
+
+# Words that mark a business name (see is_personal_name)
+_BUSINESS_KEYWORDS = frozenset(
+    set(BUSINESS_TYPE_SYNONYMS.keys())
+    | set(BUSINESS_TYPE_SYNONYMS.values())
+    | {"construccion", "materiales", "distribuidor", "comercio", "suministros"}
+)
+
+
+def _synonym_replacement(match: re.Match) -> str:
+    """Canonical form for whichever BUSINESS_TYPE_SYNONYMS_RE alternative matched"""
+    return BUSINESS_TYPE_SYNONYM_REPLACEMENTS[match.lastgroup]
+
+
+def _legal_entity_replacement(match: re.Match) -> str:
+    """Replacement for whichever LEGAL_ENTITY_RE alternative matched"""
+    return LEGAL_ENTITY_REPLACEMENTS[match.lastgroup]
+
+
+@lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)
 def remove_accents(text: str) -> str:
     """
     Remove accents/diacritics from text for better fuzzy matching
@@ -31,12 +111,48 @@ def remove_accents(text: str) -> str:
     Returns:
         Text with accents removed
     """
-    # Normalize to NFD (decompose characters into base + diacritics)
-    nfd = unicodedata.normalize('NFD', text)
-    # Filter out combining diacritical marks (category Mn)
-    return ''.join(char for char in nfd if unicodedata.category(char) != 'Mn')
+    # Fast path: pure ASCII text has no diacritics to strip
+    if text.isascii():
+        return text
+
+    # Common accented letters are replaced in C, without decomposing the string
+    translated = text.translate(_ACCENT_TABLE)
+    if translated.isascii():
+        return translated
+
+    # Anything else (other scripts, already-decomposed text): NFD and drop the marks
+    return _strip_combining_marks(translated)
 
 
+@lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)
+def lower_and_remove_accents(text: str) -> str:
+    """
+    Lowercase text and remove accents in one step
+
+    Same result as remove_accents(text.lower()), but Latin text is handled by a
+    single str.translate instead of two passes over the string.
+
+    Example:
+        'FRAILE Y NÚÑEZ' -> 'fraile y nunez'
+
+    Args:
+        text: Input text with potential capitals and accents
+
+    Returns:
+        Lowercase text with accents removed
+    """
+    if text.isascii():
+        return text.lower()
+
+    translated = text.translate(_LOWER_ACCENT_TABLE)
+    if translated.isascii():
+        return translated
+
+    # Characters outside the table (other scripts, combining marks): full Unicode lower()
+    return remove_accents(text.lower())
+
+
+@lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)
 def normalize_business_name(text: str) -> str:
     """
     Normalize Spanish business name for fuzzy matching.
@@ -62,31 +178,31 @@ def normalize_business_name(text: str) -> str:
     """
     try:
         # Step 1: Lowercase, remove accents, strip
-        normalized = remove_accents(text.lower().strip())
+        normalized = lower_and_remove_accents(text.strip())
+
+        # Lowercase ASCII text (the usual case) can skip case-insensitive matching
+        if normalized.isascii():
+            synonyms_re, legal_entity_re = BUSINESS_TYPE_SYNONYMS_LOWER_RE, LEGAL_ENTITY_LOWER_RE
+        else:
+            synonyms_re, legal_entity_re = BUSINESS_TYPE_SYNONYMS_RE, LEGAL_ENTITY_RE
 
-        # Step 2: Apply business type synonyms (word boundary matching)
-        for synonym_from, synonym_to in BUSINESS_TYPE_SYNONYMS.items():
-            # Use word boundary to avoid partial word matches
-            pattern = r'\b' + re.escape(synonym_from) + r'\b'
-            normalized = re.sub(pattern, synonym_to, normalized, flags=re.IGNORECASE)
+        # Step 2: Apply business type synonyms (word boundary matching, single pass)
+        normalized = synonyms_re.sub(_synonym_replacement, normalized)
 
-        # Step 3: Normalize legal entity suffixes
-        for compiled_pattern, replacement in COMPILED_LEGAL_ENTITY_PATTERNS:
-            normalized = compiled_pattern.sub(replacement, normalized)
+        # Step 3: Normalize legal entity suffixes (all patterns in a single pass)
+        normalized = legal_entity_re.sub(_legal_entity_replacement, normalized)
 
         # Step 4: Remove commas and collapse spaces
         normalized = normalized.replace(',', ' ')
-        normalized = re.sub(r'\s+', ' ', normalized)
+        normalized = _WHITESPACE_RE.sub(' ', normalized)
 
         # Step 5: Strip again
         return normalized.strip()
 
-    except Exception as e:
+    except (re.error, ValueError) as e:
         # Fallback to original text if normalization fails
         # This ensures the system degrades gracefully
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.warning(f"Normalization failed for '{text}': {e}. Using original text.")
+        logger.warning("Normalization failed for '%s': %s. Using original text.", text, e)
         return text.lower().strip()
 
 
@@ -110,16 +226,20 @@ def extract_buying_group_keywords(text: str) -> List[str]:
         >>> extract_buying_group_keywords("MATERIALES ABC")
         []
     """
-    text_lower = text.lower()
-    matched_keywords = []
+    # Fresh list per call: the memoized result is shared
+    return list(_extract_buying_group_keywords(text))
+
 
-    for keyword in BUYING_GROUP_KEYWORDS:
-        # Use word boundary to avoid partial matches
-        pattern = r'\b' + re.escape(keyword) + r'\b'
-        if re.search(pattern, text_lower):
-            matched_keywords.append(keyword)
+@lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)
+def _extract_buying_group_keywords(text: str) -> Tuple[str, ...]:
+    """Memoized body of extract_buying_group_keywords (returns an immutable tuple)"""
+    # One whole-word scan for all keywords (word boundaries avoid partial matches)
+    found = set(BUYING_GROUP_KEYWORDS_RE.findall(text.lower()))
+    if not found:
+        return ()
 
-    return matched_keywords
+    # Report in BUYING_GROUP_KEYWORDS order, each keyword once
+    return tuple(keyword for keyword in BUYING_GROUP_KEYWORDS if keyword in found)
 
 
 def calculate_boosted_similarity(
@@ -181,6 +301,29 @@ def calculate_boosted_similarity(
     return boosted_score
 
 
+def calculate_boosted_similarity_vec(base_scores: np.ndarray, matched_counts: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_boosted_similarity for many pairs at once.
+
+    Applies the same boost rules element-wise, given how many buying group
+    keywords each pair has in common (len(set(keywords1) & set(keywords2))).
+
+    Args:
+        base_scores: Base similarity scores (0.0 to 1.0)
+        matched_counts: Number of matched buying group keywords per pair
+            (broadcast against base_scores)
+
+    Returns:
+        Array of boosted similarity scores (0.0 to 1.0)
+
+    Example:
+        >>> calculate_boosted_similarity_vec(np.array([0.78, 0.78, 0.95]), np.array([1, 0, 2]))
+        array([0.88, 0.78, 1.  ])
+    """
+    boosts = np.where(matched_counts >= 2, 0.15, np.where(matched_counts == 1, 0.10, 0.0))
+    return np.minimum(base_scores + boosts, 1.0)
+
+
 def is_personal_name(text: str) -> bool:
     """
     Detect if a name is a personal name vs business name.
@@ -204,16 +347,9 @@ def is_personal_name(text: str) -> bool:
         >>> is_personal_name("barroso morales maria antonia")
         True
     """
-    from .spanish_business_synonyms import BUSINESS_TYPE_SYNONYMS
-
-    # Check 1: Legal entity suffix patterns
-    legal_entity_patterns = [
-        r'\bsl\b', r'\bsa\b', r'\bsc\b', r'\bs\.l\b', r'\bs\.a\b', r'\bs\.c\b',
-        r'\bs\.l\.u\b', r'\bs\.l\.l\b', r'\bslu\b', r'\bsll\b',
-    ]
-    for pattern in legal_entity_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            return False  # Has legal entity suffix -> business name
+    # Check 1: Legal entity suffix patterns (one scan for all of them)
+    if _LEGAL_ENTITY_SUFFIX_RE.search(text):
+        return False  # Has legal entity suffix -> business name
 
     # Check 2: Token count (personal names typically 2-6 words)
     tokens = text.split()
@@ -221,18 +357,15 @@ def is_personal_name(text: str) -> bool:
         return False  # Too many words -> likely business name
 
     # Check 3: Business keywords
-    business_keywords = set(BUSINESS_TYPE_SYNONYMS.keys()) | set(BUSINESS_TYPE_SYNONYMS.values())
-    business_keywords.update(["construccion", "materiales", "distribuidor", "comercio", "suministros"])
-
     text_lower = text.lower()
-    for keyword in business_keywords:
-        if keyword in text_lower:
-            return False  # Has business keyword -> business name
+    if any(keyword in text_lower for keyword in _BUSINESS_KEYWORDS):
+        return False  # Has business keyword -> business name
 
     # If none of the above, likely a personal name
     return True
 
 
+@lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)
 def normalize_personal_name(text: str) -> str:
     """
     Normalize Spanish personal name for fuzzy matching.
@@ -261,45 +394,18 @@ def normalize_personal_name(text: str) -> str:
         # Input 2: "antonio barroso maria morales" (sorted)
         # token_set_ratio handles the missing "morales" gracefully
     """
-    from .spanish_business_synonyms import SPANISH_GENDERED_NAMES
-
     try:
-        # Step 1: Tokenize
-        tokens = text.split()
-
-        # Step 2: Normalize gendered names
-        normalized_tokens = []
-        for token in tokens:
-            # If token is a gendered name, normalize to its pair
-            # This makes ANTONIO and ANTONIA equivalent
-            if token in SPANISH_GENDERED_NAMES:
-                # Always normalize to alphabetically first variant
-                variant = SPANISH_GENDERED_NAMES[token]
-                normalized_token = min(token, variant)  # e.g., min("antonio", "antonia") = "antonio"
-                normalized_tokens.append(normalized_token)
-            else:
-                normalized_tokens.append(token)
-
-        # Step 3: Sort tokens alphabetically
-        # This handles word order: "MARIA ANTONIO BARROSO" and "BARROSO MARIA ANTONIO" -> same
-        normalized_tokens.sort()
-
-        # Step 4: Remove duplicates (preserve order after sort)
-        seen = set()
-        unique_tokens = []
-        for token in normalized_tokens:
-            if token not in seen:
-                seen.add(token)
-                unique_tokens.append(token)
+        # Steps 1-4: Tokenize, map gendered names to their canonical variant
+        # (this makes ANTONIO and ANTONIA equivalent), then de-duplicate and sort.
+        # Sorting handles word order: "MARIA ANTONIO BARROSO" and "BARROSO MARIA ANTONIO" -> same
+        unique_tokens = sorted({_GENDERED_NAME_CANONICAL.get(token, token) for token in text.split()})
 
         # Step 5: Join back to string
         return " ".join(unique_tokens)
 
-    except Exception as e:
+    except ValueError as e:
         # Fallback to original text if normalization fails
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.warning(f"Personal name normalization failed for '{text}': {e}. Using original text.")
+        logger.warning("Personal name normalization failed for '%s': %s. Using original text.", text, e)
         return text
 
 
@@ -326,7 +432,6 @@ def calculate_jaro_winkler_similarity(text1: str, text2: str, prefix_weight: flo
         >>> calculate_jaro_winkler_similarity("famicas", "famicast sl")
         0.87  # High score despite missing 'T' - prefix match boosted
     """
-    from rapidfuzz.distance import JaroWinkler
     return JaroWinkler.normalized_similarity(text1, text2, prefix_weight=prefix_weight)
 
 
@@ -357,24 +462,64 @@ def calculate_weighted_token_similarity(
         ... )
         0.87  # Slight boost for surname "barroso" match
     """
-    from .spanish_business_synonyms import (
-        COMMON_SPANISH_GIVEN_NAMES,
-        COMMON_SPANISH_SURNAMES
+    return calculate_prepared_token_similarity(
+        prepare_personal_name(text1),
+        prepare_personal_name(text2),
+        base_score
     )
 
-    # Tokenize both names
-    tokens1 = set(text1.split())
-    tokens2 = set(text2.split())
 
+class PreparedPersonalName(NamedTuple):
+    """Token sets of a normalized personal name, computed once per name"""
+    tokens: FrozenSet[str]
+    surnames: FrozenSet[str]      # tokens that are common Spanish surnames
+    given_names: FrozenSet[str]   # tokens that are common Spanish given names
+
+
+@lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)
+def prepare_personal_name(text: str) -> PreparedPersonalName:
+    """
+    Split a normalized personal name into the token sets used for weighted scoring.
+
+    Args:
+        text: Normalized personal name
+
+    Returns:
+        PreparedPersonalName for calculate_prepared_token_similarity
+    """
+    tokens = frozenset(text.split())
+    return PreparedPersonalName(
+        tokens,
+        tokens & COMMON_SPANISH_SURNAMES,
+        tokens & COMMON_SPANISH_GIVEN_NAMES,
+    )
+
+
+def calculate_prepared_token_similarity(
+    name1: PreparedPersonalName,
+    name2: PreparedPersonalName,
+    base_score: float
+) -> float:
+    """
+    calculate_weighted_token_similarity for names already run through prepare_personal_name.
+
+    Args:
+        name1: First prepared personal name
+        name2: Second prepared personal name
+        base_score: Base similarity score from token_set_ratio
+
+    Returns:
+        Adjusted similarity score (can be slightly higher or lower than base)
+    """
     # Find common tokens
-    common_tokens = tokens1 & tokens2
+    common_tokens = name1.tokens & name2.tokens
 
     if not common_tokens:
         return base_score  # No common tokens, return base score
 
-    # Calculate weighted bonus
-    surname_matches = sum(1 for token in common_tokens if token in COMMON_SPANISH_SURNAMES)
-    given_name_matches = sum(1 for token in common_tokens if token in COMMON_SPANISH_GIVEN_NAMES)
+    # Calculate weighted bonus (common tokens are a subset of name1's tokens)
+    surname_matches = len(common_tokens & name1.surnames)
+    given_name_matches = len(common_tokens & name1.given_names)
 
     # Boost for surname matches (+0.03 per surname match, max +0.06)
     # Penalty for only given name matches (-0.02 per given name if no surnames match)
@@ -0,0 +1,11 @@
+-- Migration: Index email_lookup_for_customer by LOWER(emailaddress)
+-- Run this against your PostgreSQL database so case-insensitive email lookups use an index
+-- instead of scanning the table (the primary key on emailaddress can't serve LOWER(emailaddress))
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_email_lookup_lower
+ON public.email_lookup_for_customer (LOWER(emailaddress));
+
+-- Verify: the plan should show "Index Scan using ix_email_lookup_lower" (or a Bitmap Index Scan)
+-- EXPLAIN SELECT customerid, customername
+-- FROM public.email_lookup_for_customer
+-- WHERE LOWER(emailaddress) = ANY(ARRAY['someone@example.com']);
@@ -0,0 +1,5 @@
+-- Migration: Index ai_tool_output_table by job_id
+-- Run this against your PostgreSQL database so per-job lookups (e.g. job_runs counts) avoid a full table scan
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ai_tool_output_table_job_id
+ON public.ai_tool_output_table (job_id);
@@ -9,12 +9,12 @@ and moves them to ProcessedOrders_Text_Orders folder.
 Workflow:
     1. Query DB for email_ids where email_directory IS NULL
     2. Fetch emails from WIP_Text_Orders folder
-    3. For each match:
-       - Download .eml content
+    3. For the matches:
+       - Download .eml content (several in parallel)
        - Save to W: drive (W:\\PEDIDOS Y ALBARANES\\PEDIDOS DIGITAL\\YYMMDD\\YYMMDDAI\\)
-       - Categorize email as Green
-       - Move email from WIP → ProcessedOrders folder
-       - Update email_directory in database
+       - Categorize emails as Green (Graph $batch, up to 20 per call)
+       - Move emails from WIP → ProcessedOrders folder (Graph $batch)
+       - Update email_directory in database after each move batch
 
 Usage:
     python scripts/export_emails_to_w_drive.py
@@ -24,9 +24,13 @@ Prerequisites:
     - .env file with DATABASE_URL and Microsoft Graph API credentials
 """
 
+import json
 import os
+import re
 import sys
+import threading
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import requests
@@ -39,6 +43,33 @@ load_dotenv()
 # Configuration
 EXPORT_BASE_PATH = Path(r"W:\PEDIDOS Y ALBARANES\PEDIDOS DIGITAL")
 DATE_FOLDER_FORMAT = "%y%m%d"  # e.g., 251211 (parent folder, AI subfolder added separately)
+GRAPH_BATCH_URL = "https://graph.microsoft.com/v1.0/$batch"
+GRAPH_BATCH_LIMIT = 20  # Maximum requests per Graph $batch call
+DOWNLOAD_WORKERS = 8  # Parallel .eml downloads
+GREEN_CATEGORY = "Green"
+COPY_UPDATE_MIN_ROWS = 100  # Database updates from this many rows go through COPY
+DIRECT_LOOKUP_MAX_IDS = 100  # Fewer DB email IDs than this are fetched by ID instead of listing the folder
+MESSAGE_FIELDS = "id,subject,receivedDateTime"  # Only message fields the export uses
+FOLDER_ID_CACHE_FILE = Path(
+    os.getenv("FOLDER_ID_CACHE_FILE", Path.home() / ".cache" / "text_orders" / "folder_ids.json")
+)  # Resolved folder IDs, reused across runs
+
+# Characters not allowed in exported file names: anything but letters, digits, space, '-' and '_'
+# (\w is exactly str.isalnum() plus '_')
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^\w \-]')
+
+_thread_local = threading.local()
+
+# Resolved folder IDs: {user_id: {folder_path: folder_id}}, loaded from FOLDER_ID_CACHE_FILE on first use
+_folder_ids = None
+
+
+def get_session():
+    """Get this thread's requests.Session (reuses HTTPS connections across calls)"""
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = _thread_local.session = requests.Session()
+    return session
 
 
 def get_access_token():
@@ -55,7 +86,7 @@ def get_access_token():
         'scope': 'https://graph.microsoft.com/.default'
     }
 
-    response = requests.post(token_url, data=token_data)
+    response = get_session().post(token_url, data=token_data)
     response.raise_for_status()
     return response.json()['access_token']
 
@@ -67,32 +98,119 @@ def get_db_connection():
 
 
 def get_emails_without_directory(conn):
-    """Query database for emails where email_directory is NULL"""
-    cursor = conn.cursor()
+    """
+    Query database for emails where email_directory is NULL
+
+    Rows are streamed from a server-side cursor rather than fetched all at once.
+
+    Returns:
+        Dict mapping normalized email ID -> original DB email ID
+        (DB IDs have +/ characters, Graph API IDs use -_ (URL-safe), see normalize_email_id)
+    """
     query = """
-        SELECT DISTINCT email_id
+        SELECT DISTINCT replace(replace(email_id, '+', '-'), '/', '-') AS normalized_id, email_id
         FROM public.ai_tool_output_table
         WHERE email_directory IS NULL
         AND email_id IS NOT NULL
     """
-    cursor.execute(query)
-    rows = cursor.fetchall()
-    cursor.close()
-    return [row[0] for row in rows]
+    with conn.cursor(name="emails_without_directory") as cursor:
+        cursor.itersize = 5000
+        cursor.execute(query)
+        return {normalized_id: email_id for normalized_id, email_id in cursor}
 
 
-def update_email_directory(conn, email_id, file_path):
-    """Update email_directory field in database"""
+def update_email_directories(conn, updates):
+    """
+    Update email_directory for many emails in a single transaction
+
+    Small batches use executemany (pipelined by psycopg); large ones are
+    copied into a temp table and applied with one UPDATE ... FROM.
+
+    Args:
+        conn: Database connection
+        updates: List of (email_id, file_path)
+    """
+    if not updates:
+        return
+
     cursor = conn.cursor()
-    query = "UPDATE public.ai_tool_output_table SET email_directory = %s WHERE email_id = %s"
-    cursor.execute(query, (file_path, email_id))
-    conn.commit()
-    rows_updated = cursor.rowcount
-    cursor.close()
-    return rows_updated > 0
+    try:
+        if len(updates) >= COPY_UPDATE_MIN_ROWS:
+            cursor.execute("""
+                CREATE TEMP TABLE email_directory_updates (email_id text, file_path text) ON COMMIT DROP
+            """)
+            with cursor.copy("COPY email_directory_updates (email_id, file_path) FROM STDIN") as copy:
+                for row in updates:
+                    copy.write_row(row)
+            cursor.execute("""
+                UPDATE public.ai_tool_output_table t
+                SET email_directory = u.file_path
+                FROM email_directory_updates u
+                WHERE t.email_id = u.email_id
+            """)
+        else:
+            query = "UPDATE public.ai_tool_output_table SET email_directory = %s WHERE email_id = %s"
+            cursor.executemany(query, [(file_path, email_id) for email_id, file_path in updates])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def load_folder_ids():
+    """Get the folder ID cache, reading FOLDER_ID_CACHE_FILE the first time"""
+    global _folder_ids
+    if _folder_ids is None:
+        try:
+            _folder_ids = json.loads(FOLDER_ID_CACHE_FILE.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            _folder_ids = {}
+    return _folder_ids
+
+
+def save_folder_ids(folder_ids):
+    """Write the folder ID cache to FOLDER_ID_CACHE_FILE (best effort)"""
+    try:
+        FOLDER_ID_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        FOLDER_ID_CACHE_FILE.write_text(json.dumps(folder_ids, indent=2), encoding='utf-8')
+    except OSError as e:
+        print(f"  Warning: Could not write folder ID cache {FOLDER_ID_CACHE_FILE}: {e}")
+
+
+def folder_exists(access_token, user_id, folder_id):
+    """Check that a folder ID still exists (one GET, instead of walking the path)"""
+    headers = {'Authorization': f'Bearer {access_token}'}
+    url = f"https://graph.microsoft.com/v1.0/users/{user_id}/mailFolders/{folder_id}?$select=id"
+    response = get_session().get(url, headers=headers)
+    if response.status_code == 404:
+        return False
+    response.raise_for_status()
+    return True
 
 
 def find_folder(access_token, user_id, folder_path):
+    """
+    Get a folder ID by path (e.g., 'Inbox/FD/ProcessedOrders_Text_Orders')
+
+    Folder IDs are stable, so resolved paths are cached in FOLDER_ID_CACHE_FILE;
+    a cached ID is checked with one GET and the path is walked again if it is gone.
+    """
+    folder_ids = load_folder_ids()
+    user_folder_ids = folder_ids.setdefault(user_id, {})
+
+    cached_id = user_folder_ids.get(folder_path)
+    if cached_id and folder_exists(access_token, user_id, cached_id):
+        return cached_id
+
+    folder_id = walk_folder_path(access_token, user_id, folder_path)
+    user_folder_ids[folder_path] = folder_id
+    save_folder_ids(folder_ids)
+    return folder_id
+
+
+def walk_folder_path(access_token, user_id, folder_path):
     """Navigate to a folder by path (e.g., 'Inbox/FD/ProcessedOrders_Text_Orders')"""
     headers = {'Authorization': f'Bearer {access_token}'}
 
@@ -111,7 +229,7 @@ def find_folder(access_token, user_id, folder_path):
         folders = []
         current_url = f"{url}?$top=999"
         while current_url:
-            response = requests.get(current_url, headers=headers)
+            response = get_session().get(current_url, headers=headers)
             response.raise_for_status()
             data = response.json()
             folders.extend(data.get('value', []))
@@ -129,11 +247,14 @@ def find_folder(access_token, user_id, folder_path):
 def get_emails_from_folder(access_token, user_id, folder_id):
     """Get all emails from a folder (IDs are kept as-is from Graph API)"""
     headers = {'Authorization': f'Bearer {access_token}'}
-    url = f"https://graph.microsoft.com/v1.0/users/{user_id}/mailFolders/{folder_id}/messages?$top=500"
+    url = (
+        f"https://graph.microsoft.com/v1.0/users/{user_id}/mailFolders/{folder_id}/messages"
+        f"?$top=999&$select={MESSAGE_FIELDS}"
+    )
 
     all_emails = {}
     while url:
-        response = requests.get(url, headers=headers)
+        response = get_session().get(url, headers=headers)
         response.raise_for_status()
         data = response.json()
 
@@ -151,13 +272,47 @@ def get_emails_from_folder(access_token, user_id, folder_id):
     return all_emails
 
 
+def get_emails_by_id(access_token, user_id, folder_id, email_ids):
+    """
+    Get the given emails that are in a folder, fetched by ID through $batch
+
+    Same result shape as get_emails_from_folder, without listing the whole folder.
+    """
+    batch_requests = [
+        (
+            email_id,
+            "GET",
+            f"/users/{user_id}/messages/{urllib.parse.quote(email_id, safe='')}"
+            f"?$select={MESSAGE_FIELDS},parentFolderId",
+            None,
+        )
+        for email_id in email_ids
+    ]
+    responses = send_graph_batch(access_token, batch_requests)
+
+    found_emails = {}
+    for email_id in email_ids:
+        response = responses[email_id]
+        email = response.get('body') or {}
+        # Messages that don't exist (404) or are in another folder are skipped, as in a folder listing
+        if not is_success(response) or email.get('parentFolderId') != folder_id:
+            continue
+        found_emails[email['id']] = {
+            'id': email['id'],
+            'subject': email.get('subject', 'No Subject'),
+            'receivedDateTime': email.get('receivedDateTime', '')
+        }
+
+    return found_emails
+
+
 def download_email_content(access_token, user_id, email_id):
     """Download email as .eml file content"""
     headers = {'Authorization': f'Bearer {access_token}'}
     encoded_email_id = urllib.parse.quote(email_id, safe='')
     url = f"https://graph.microsoft.com/v1.0/users/{user_id}/messages/{encoded_email_id}/$value"
 
-    response = requests.get(url, headers=headers)
+    response = get_session().get(url, headers=headers)
     response.raise_for_status()
     return response.content
 
@@ -169,9 +324,9 @@ def categorize_email_green(access_token, user_id, email_id):
     url = f"https://graph.microsoft.com/v1.0/users/{user_id}/messages/{encoded_email_id}"
 
     # Try different green category names
-    for category_name in ["Green", "Green category", "Category 3", "Processed"]:
+    for category_name in [GREEN_CATEGORY, "Green category", "Category 3", "Processed"]:
         try:
-            response = requests.patch(url, json={"categories": [category_name]}, headers=headers)
+            response = get_session().patch(url, json={"categories": [category_name]}, headers=headers)
             response.raise_for_status()
             return True
         except:
@@ -186,11 +341,99 @@ def move_email_to_folder(access_token, user_id, email_id, destination_folder_id)
     encoded_email_id = urllib.parse.quote(email_id, safe='')
     url = f"https://graph.microsoft.com/v1.0/users/{user_id}/messages/{encoded_email_id}/move"
 
-    response = requests.post(url, json={"destinationId": destination_folder_id}, headers=headers)
+    response = get_session().post(url, json={"destinationId": destination_folder_id}, headers=headers)
     response.raise_for_status()
     return True
 
 
+def send_graph_batch(access_token, batch_requests):
+    """
+    Send requests through Graph's $batch endpoint, GRAPH_BATCH_LIMIT per call
+
+    Args:
+        access_token: Graph API access token
+        batch_requests: List of (key, method, url, body) with url relative to /v1.0
+            (body is None for requests without one, e.g. GET)
+
+    Returns:
+        Dict mapping each key to its response ({'status': ..., 'body': ...});
+        status is 0 if Graph returned no response for it
+    """
+    headers = {'Authorization': f'Bearer {access_token}', 'Content-Type': 'application/json'}
+    responses = {}
+
+    for start in range(0, len(batch_requests), GRAPH_BATCH_LIMIT):
+        chunk = batch_requests[start:start + GRAPH_BATCH_LIMIT]
+        body = {"requests": []}
+        for index, (_, method, url, request_body) in enumerate(chunk):
+            request = {"id": str(index), "method": method, "url": url}
+            if request_body is not None:
+                request["headers"] = {"Content-Type": "application/json"}
+                request["body"] = request_body
+            body["requests"].append(request)
+
+        response = get_session().post(GRAPH_BATCH_URL, json=body, headers=headers)
+        response.raise_for_status()
+
+        chunk_responses = {item['id']: item for item in response.json().get('responses', [])}
+        for index, (key, _, _, _) in enumerate(chunk):
+            responses[key] = chunk_responses.get(str(index), {'status': 0})
+
+    return responses
+
+
+def is_success(response):
+    """Whether a $batch response item has a 2xx status"""
+    return 200 <= response.get('status', 0) < 300
+
+
+def categorize_emails_green(access_token, user_id, email_ids):
+    """
+    Categorize emails with green color in batched calls
+
+    Emails whose batched PATCH fails fall back to categorize_email_green,
+    which also tries the alternative category names.
+
+    Returns:
+        Set of email IDs that were categorized
+    """
+    batch_requests = [
+        (
+            email_id,
+            "PATCH",
+            f"/users/{user_id}/messages/{urllib.parse.quote(email_id, safe='')}",
+            {"categories": [GREEN_CATEGORY]},
+        )
+        for email_id in email_ids
+    ]
+    responses = send_graph_batch(access_token, batch_requests)
+
+    categorized = set()
+    for email_id in email_ids:
+        if is_success(responses[email_id]) or categorize_email_green(access_token, user_id, email_id):
+            categorized.add(email_id)
+    return categorized
+
+
+def move_emails_to_folder(access_token, user_id, email_ids, destination_folder_id):
+    """
+    Move emails to destination folder in batched calls
+
+    Returns:
+        Dict mapping each email ID to its move response (see send_graph_batch)
+    """
+    batch_requests = [
+        (
+            email_id,
+            "POST",
+            f"/users/{user_id}/messages/{urllib.parse.quote(email_id, safe='')}/move",
+            {"destinationId": destination_folder_id},
+        )
+        for email_id in email_ids
+    ]
+    return send_graph_batch(access_token, batch_requests)
+
+
 def export_email_to_w_drive(access_token, user_id, email_data, email_id, sequence_num):
     """Export email to W: drive"""
     date_str = datetime.now().strftime(DATE_FOLDER_FORMAT)
@@ -200,7 +443,7 @@ def export_email_to_w_drive(access_token, user_id, email_data, email_id, sequenc
     subject = email_data.get('subject', 'No subject')
 
     # Clean filename
-    safe_subject = "".join(c for c in subject[:30] if c.isalnum() or c in (' ', '-', '_')).strip() or "email"
+    safe_subject = _UNSAFE_FILENAME_CHARS_RE.sub('', subject[:30]).strip() or "email"
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
     filename = f"{safe_subject}_{timestamp}_{sequence_num:02d}.eml"
     file_path = date_folder / filename
@@ -214,7 +457,11 @@ def export_email_to_w_drive(access_token, user_id, email_data, email_id, sequenc
 
 
 def normalize_email_id(email_id):
-    """Normalize email ID for comparison (convert Base64 to URL-safe format)"""
+    """
+    Normalize email ID for comparison (convert Base64 to URL-safe format)
+
+    get_emails_without_directory applies the same mapping in SQL.
+    """
     return email_id.replace('+', '-').replace('/', '-')
 
 
@@ -236,11 +483,12 @@ def main():
     conn = get_db_connection()
 
     # Get emails without directory
+    # Lookup: normalized DB ID -> original DB ID
     print("Querying for emails without email_directory...")
-    email_ids = get_emails_without_directory(conn)
-    print(f"Found {len(email_ids)} emails to export")
+    db_normalized_lookup = get_emails_without_directory(conn)
+    print(f"Found {len(db_normalized_lookup)} emails to export")
 
-    if not email_ids:
+    if not db_normalized_lookup:
         print("No emails to export. Exiting.")
         conn.close()
         return
@@ -258,9 +506,13 @@ def main():
     print("Finding ProcessedOrders_Text_Orders folder...")
     processed_folder_id = find_folder(access_token, user_id, "Inbox/FD/ProcessedOrders_Text_Orders")
 
-    # Get emails from WIP folder
-    print("Fetching emails from WIP_Text_Orders folder...")
-    folder_emails = get_emails_from_folder(access_token, user_id, wip_folder_id)
+    # Get emails from WIP folder (only the DB ones, by ID, when there are few of them)
+    if len(db_normalized_lookup) < DIRECT_LOOKUP_MAX_IDS:
+        print("Fetching DB emails from WIP_Text_Orders folder by ID...")
+        folder_emails = get_emails_by_id(access_token, user_id, wip_folder_id, list(db_normalized_lookup))
+    else:
+        print("Fetching emails from WIP_Text_Orders folder...")
+        folder_emails = get_emails_from_folder(access_token, user_id, wip_folder_id)
     print(f"Found {len(folder_emails)} emails in WIP folder")
 
     # Match and export
@@ -269,46 +521,88 @@ def main():
     moved_count = 0
     failed_count = 0
 
-    # Create lookup: normalized DB ID -> original DB ID
-    # DB IDs have +/ characters, Graph API IDs use -_ (URL-safe)
-    db_normalized_lookup = {normalize_email_id(eid): eid for eid in email_ids}
-
     print(f"\nLooking for {len(db_normalized_lookup)} DB email IDs in {len(folder_emails)} folder emails...")
 
-    print("\nProcessing emails...")
-    for folder_email_id, email_data in folder_emails.items():
-        # folder_email_id is already URL-safe from Graph API
-        # Check if it matches any normalized DB ID
-        if folder_email_id in db_normalized_lookup:
-            original_db_email_id = db_normalized_lookup[folder_email_id]
-            print(f"\n[{exported_count + 1}] Processing: {email_data['subject'][:50]}...")
-
-            try:
-                # Export to W: drive
-                file_path = export_email_to_w_drive(
-                    access_token, user_id, email_data, original_db_email_id, exported_count + 1
-                )
-                print(f"    ✓ Exported to: {Path(file_path).name}")
+    # folder_email_id is already URL-safe from Graph API
+    # Keep the ones that match a normalized DB ID: (folder email ID, original DB email ID, email data)
+    matched = [
+        (folder_email_id, db_normalized_lookup[folder_email_id], email_data)
+        for folder_email_id, email_data in folder_emails.items()
+        if folder_email_id in db_normalized_lookup
+    ]
 
-                # Categorize email as Green
-                if categorize_email_green(access_token, user_id, folder_email_id):
-                    categorized_count += 1
-                    print(f"    ✓ Categorized as Green")
+    # Step 1: Download and save to W: drive, several emails at a time
+    print(f"\nExporting {len(matched)} emails...")
 
-                # Move email from WIP to ProcessedOrders
-                if move_email_to_folder(access_token, user_id, folder_email_id, processed_folder_id):
-                    moved_count += 1
-                    print(f"    ✓ Moved to ProcessedOrders_Text_Orders")
+    def export_match(sequence_num, match):
+        _, original_db_email_id, email_data = match
+        try:
+            file_path = export_email_to_w_drive(
+                access_token, user_id, email_data, original_db_email_id, sequence_num
+            )
+            return file_path, None
+        except Exception as e:
+            return None, e
+
+    exported = []  # (folder email ID, original DB email ID, file path)
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+        sequence_nums = range(1, len(matched) + 1)
+        results = executor.map(export_match, sequence_nums, matched)
+        for sequence_num, match, (file_path, error) in zip(sequence_nums, matched, results):
+            folder_email_id, original_db_email_id, email_data = match
+            print(f"\n[{sequence_num}] {email_data['subject'][:50]}...")
+            if error is not None:
+                print(f"    ✗ Failed: {error}")
+                failed_count += 1
+                continue
+            print(f"    ✓ Exported to: {Path(file_path).name}")
+            exported.append((folder_email_id, original_db_email_id, file_path))
 
-                # Update database
-                update_email_directory(conn, original_db_email_id, file_path)
-                print(f"    ✓ Database updated")
+    exported_folder_ids = [folder_email_id for folder_email_id, _, _ in exported]
 
-                exported_count += 1
+    # Step 2: Categorize exported emails as Green (before moving: the move changes the message ID)
+    if exported:
+        print("\nCategorizing exported emails as Green...")
+        try:
+            categorized_count = len(categorize_emails_green(access_token, user_id, exported_folder_ids))
+        except Exception as e:
+            print(f"    ✗ Categorize failed: {e}")
+        print(f"    ✓ Categorized {categorized_count} of {len(exported)}")
+
+    # Steps 3-4: Move exported emails from WIP to ProcessedOrders, one $batch call at a time,
+    # and record each call's moved emails in the database before sending the next one
+    if exported:
+        print("Moving exported emails to ProcessedOrders_Text_Orders...")
+    for start in range(0, len(exported), GRAPH_BATCH_LIMIT):
+        chunk = exported[start:start + GRAPH_BATCH_LIMIT]
+        move_responses = {}
+        try:
+            move_responses = move_emails_to_folder(
+                access_token, user_id, [folder_email_id for folder_email_id, _, _ in chunk], processed_folder_id
+            )
+        except Exception as e:
+            print(f"    ✗ Move failed: {e}")
+
+        pending_updates = []  # (original DB email ID, file path)
+        for folder_email_id, original_db_email_id, file_path in chunk:
+            move_response = move_responses.get(folder_email_id, {'status': 0})
+            if not is_success(move_response):
+                print(f"    ✗ Failed to move {Path(file_path).name} (status {move_response.get('status', 0)})")
+                failed_count += 1
+                continue
+            pending_updates.append((original_db_email_id, file_path))
 
+        moved_count += len(pending_updates)
+        if pending_updates:
+            try:
+                update_email_directories(conn, pending_updates)
+                exported_count += len(pending_updates)
             except Exception as e:
-                print(f"    ✗ Failed: {e}")
-                failed_count += 1
+                print(f"    ✗ Failed to update database for {len(pending_updates)} moved emails: {e}")
+                failed_count += len(pending_updates)
+
+    if exported:
+        print(f"    ✓ Moved {moved_count} and updated database for {exported_count}")
 
     # Close database connection
     conn.close()